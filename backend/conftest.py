@@ -0,0 +1,34 @@
+"""
+Shared fixtures: point the app at a throwaway SQLite database
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Must be set before theke.core.config is imported. A file rather than
+# sqlite:// so sync endpoints, run in worker threads, share the database.
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/theke-test.db"
+sys.path.append(str(Path(__file__).parent / "src"))
+
+
+@pytest.fixture
+def db():
+    """A session on freshly created tables, dropped again afterwards"""
+    from sqlalchemy import text
+
+    from theke import models  # noqa: F401  (registers the tables)
+    from theke.core import database
+
+    database.create_tables()
+    session = database.SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        with database.engine.begin() as conn:
+            conn.execute(text("DROP TABLE IF EXISTS papers_fts"))
+        database.Base.metadata.drop_all(bind=database.engine)
@@ -1,22 +1,52 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Header, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from collections import OrderedDict
+from typing import Dict, List, Optional
+import asyncio
+import hashlib
 import os
+import threading
+import uuid
+from pathlib import Path
 from dotenv import find_dotenv, set_key
+import orjson
 from pydantic import BaseModel
 
 from ..core.config import settings
-from ..core.database import get_db
+from ..core.database import SessionLocal, get_db
 from ..schemas import paper as paper_schema, job as job_schema
-from ..crud import paper as paper_crud, job as job_crud
-from ..services.pdf_processor import extract_metadata_from_pdf
-from ..services.llm_service import generate_summary
+from ..crud import paper as paper_crud, job as job_crud, summary_cache as summary_cache_crud
+from ..services.pdf_processor import (
+    extract_metadata_from_file,
+    extract_metadata_from_pdf,
+    extract_text_from_pdf_file,
+    new_content_hash,
+)
+from ..services.llm_service import generate_summary, get_llm_model_name, get_llm_provider, stream_summary
 from ..utils.errors import handle_service_errors
+from ..utils.http import etag_matches
 
 router = APIRouter()
 
 
+def _etag_response(body: bytes, if_none_match: Optional[str]) -> Response:
+    """Return a JSON body with an ETag, or 304 if the client already has it"""
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+# Resolve the .env location once; find_dotenv walks up the directory tree
+_ENV_PATH = find_dotenv() or os.path.join(os.path.dirname(__file__), "..", "..", "..", ".env")
+
+# set_key rewrites the whole file, so concurrent updates must not interleave
+_env_lock = threading.Lock()
+
+
 class PromptUpdate(BaseModel):
     prompt: str
 
@@ -27,7 +57,7 @@ class SummaryRequest(BaseModel):
 
 @router.get("/settings/summary-prompt", response_model=PromptUpdate)
 @handle_service_errors()
-def get_summary_prompt() -> PromptUpdate:
+async def get_summary_prompt() -> PromptUpdate:
     """Get the current summary prompt"""
     return PromptUpdate(prompt=settings.SUMMARY_PROMPT)
 
@@ -35,28 +65,22 @@ def get_summary_prompt() -> PromptUpdate:
 def update_summary_prompt(prompt_update: PromptUpdate):
     """Update the summary prompt in the .env file"""
     try:
-        env_path = find_dotenv()
-        if not env_path:
-            # If .env is not found, assume it's in the project root
-            env_path = os.path.join(os.path.dirname(__file__), "..", "..", "..", ".env")
+        with _env_lock:
+            # Create the file if it doesn't exist
+            open(_ENV_PATH, "a").close()
 
-        if not os.path.exists(env_path):
-             # Create the file if it doesn't exist
-            with open(env_path, "w") as f:
-                pass
+            set_key(_ENV_PATH, "SUMMARY_PROMPT", prompt_update.prompt)
 
-        set_key(env_path, "SUMMARY_PROMPT", prompt_update.prompt)
-        
-        # Update the settings object in memory
-        settings.SUMMARY_PROMPT = prompt_update.prompt
+            # Update the settings object in memory
+            settings.SUMMARY_PROMPT = prompt_update.prompt
         
         return {"message": "Summary prompt updated successfully. Restart the application for the changes to take full effect."}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to update .env file: {str(e)}")
 
 
-
-@router.get("/")
+# response_model only documents the schema: the body is serialized below, None fields omitted
+@router.get("/", response_model=paper_schema.PaperList)
 def get_papers(
     skip: int = 0,
     limit: int = 100,
@@ -69,10 +93,16 @@ def get_papers(
     has_summary: Optional[bool] = None,
     has_pdf: Optional[bool] = None,
     author: Optional[str] = None,
+    include_total: bool = True,
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db)
 ):
-    """Get all papers with advanced filtering, sorting, and search"""
-    papers, total_count = paper_crud.get_papers(
+    """Get all papers with advanced filtering, sorting, and search
+
+    Pass include_total=false to skip counting all matches when only
+    has_more is needed; total is then omitted from the response.
+    """
+    papers, total_count, has_more = paper_crud.get_papers(
         db=db, 
         skip=skip, 
         limit=limit, 
@@ -84,16 +114,21 @@ def get_papers(
         year_to=year_to,
         has_summary=has_summary,
         has_pdf=has_pdf,
-        author=author
+        author=author,
+        include_total=include_total
     )
     
-    return {
-        "papers": papers,
-        "total": total_count,
-        "skip": skip,
-        "limit": limit,
-        "has_more": skip + limit < total_count
-    }
+    paper_list = paper_schema.PaperList.model_validate(
+        {
+            "papers": papers,
+            "total": total_count,
+            "skip": skip,
+            "limit": limit,
+            "has_more": has_more
+        },
+        from_attributes=True,
+    )
+    return _etag_response(paper_list.model_dump_json(exclude_none=True).encode(), if_none_match)
 
 
 @router.post("/", response_model=paper_schema.Paper)
@@ -132,47 +167,54 @@ async def upload_paper(
 ):
     """Upload a PDF and create a paper entry with extracted metadata"""
     try:
-        # Reset file pointer to beginning
-        await file.seek(0)
-        
-        # Extract metadata from PDF
-        metadata = await extract_metadata_from_pdf(file, use_llm=use_llm_extraction)
-        
-        # Reset file pointer again for saving
+        # Stream the upload to disk once; extraction and storage both use that copy
         await file.seek(0)
-        
-        # Override with form data if provided
-        if title:
-            metadata["title"] = title
-        if authors:
-            import json
-            metadata["authors"] = json.loads(authors)
-        
-        # Create paper
-        paper_data = paper_schema.PaperCreate(**metadata)
-        paper = paper_crud.create_paper(db=db, paper=paper_data)
-        
-        # Save PDF file and update paper with file path
+        content_hash = new_content_hash()
+        spool_path = await paper_crud.spool_pdf_upload(file, content_hash)
+
         try:
-            file_path = await paper_crud.save_pdf_file(paper.id, file)
-            print(f"Got file_path from save_pdf_file: {file_path}")
-            if file_path:
-                paper_update = paper_schema.PaperUpdate(pdf_path=file_path)
-                print(f"Updating paper with pdf_path: {file_path}")
-                updated_paper = paper_crud.update_paper(db=db, paper_id=paper.id, paper_update=paper_update)
-                if updated_paper:
-                    paper = updated_paper
-                    print(f"Paper updated successfully, pdf_path: {paper.pdf_path}")
+            # Extract metadata from PDF
+            metadata = await extract_metadata_from_file(
+                spool_path, content_hash.digest(), file.filename or "", use_llm=use_llm_extraction
+            )
+            
+            # Override with form data if provided
+            if title:
+                metadata["title"] = title
+            if authors:
+                metadata["authors"] = orjson.loads(authors)
+            
+            # Create paper
+            paper_data = paper_schema.PaperCreate(**metadata)
+            paper = await run_in_threadpool(paper_crud.create_paper, db=db, paper=paper_data)
+            
+            # Store PDF file and update paper with file path
+            try:
+                file_path = paper_crud.store_spooled_pdf(paper.id, spool_path, file.filename)
+                print(f"Got file_path from store_spooled_pdf: {file_path}")
+                if file_path:
+                    paper_update = paper_schema.PaperUpdate(pdf_path=file_path)
+                    print(f"Updating paper with pdf_path: {file_path}")
+                    updated_paper = await run_in_threadpool(
+                        paper_crud.update_paper, db=db, paper_id=paper.id, paper_update=paper_update
+                    )
+                    if updated_paper:
+                        paper = updated_paper
+                        print(f"Paper updated successfully, pdf_path: {paper.pdf_path}")
+                    else:
+                        print("Warning: update_paper returned None")
                 else:
-                    print("Warning: update_paper returned None")
-            else:
-                print("Warning: save_pdf_file returned None")
-        except Exception as file_save_error:
-            print(f"File save error: {file_save_error}")
-            # Continue without saving file, but paper record is still created
-        
-        return paper
-        
+                    print("Warning: store_spooled_pdf returned None")
+            except Exception as file_save_error:
+                print(f"File save error: {file_save_error}")
+                # Continue without saving file, but paper record is still created
+        finally:
+            # Already renamed if stored; otherwise drop the abandoned spool file
+            spool_path.unlink(missing_ok=True)
+
+        # Serializing reads paper.tags, which lazy-loads; keep that query off the event loop
+        return await run_in_threadpool(paper_schema.Paper.model_validate, paper)
+
     except ValueError as e:
         # Configuration errors (API key missing, etc.)
         raise HTTPException(status_code=400, detail=str(e))
@@ -189,12 +231,17 @@ async def upload_paper(
 
 
 @router.get("/{paper_id}", response_model=paper_schema.Paper)
-def get_paper(paper_id: int, db: Session = Depends(get_db)):
+def get_paper(
+    paper_id: int,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
     """Get a specific paper by ID"""
     paper = paper_crud.get_paper(db=db, paper_id=paper_id)
     if not paper:
         raise HTTPException(status_code=404, detail="Paper not found")
-    return paper
+    body = paper_schema.Paper.model_validate(paper).model_dump_json().encode()
+    return _etag_response(body, if_none_match)
 
 
 @router.put("/{paper_id}", response_model=paper_schema.Paper)
@@ -219,60 +266,118 @@ def delete_paper(paper_id: int, db: Session = Depends(get_db)):
     return {"message": "Paper deleted successfully"}
 
 
-@router.get("/{paper_id}/thumbnail")
-async def get_paper_thumbnail(paper_id: int, db: Session = Depends(get_db)):
-    """Get or generate a thumbnail for a paper's PDF"""
-    paper = paper_crud.get_paper(db=db, paper_id=paper_id)
-    if not paper:
-        raise HTTPException(status_code=404, detail="Paper not found")
-
-    if not paper.pdf_path:
-        raise HTTPException(status_code=404, detail="Paper does not have a PDF file")
+def _render_thumbnail(pdf_path: str, thumbnail_path: Path) -> None:
+    """Render the first page of a PDF to a PNG thumbnail"""
+    import fitz  # PyMuPDF
 
-    # Check if PDF file exists
-    if not os.path.exists(paper.pdf_path):
-        raise HTTPException(status_code=404, detail="PDF file not found")
+    # Open PDF
+    pdf_document = fitz.open(pdf_path)
 
-    # Generate thumbnail path
-    from pathlib import Path
-    upload_dir = Path(settings.UPLOAD_DIR)
-    thumbnails_dir = upload_dir / "thumbnails"
-    thumbnails_dir.mkdir(exist_ok=True)
+    try:
+        # Get first page
+        first_page = pdf_document[0]
 
-    pdf_filename = Path(paper.pdf_path).stem
-    thumbnail_path = thumbnails_dir / f"{pdf_filename}.png"
+        # Render page to image (matrix for zoom/resolution)
+        zoom = 2.0  # Zoom factor for higher quality
+        mat = fitz.Matrix(zoom, zoom)
+        pix = first_page.get_pixmap(matrix=mat)
 
-    # Generate thumbnail if it doesn't exist
-    if not thumbnail_path.exists():
+        # Save as PNG under a temporary name and move it into place, so a
+        # concurrent request never sees a partially written file
+        tmp_path = thumbnail_path.with_name(f".{thumbnail_path.stem}.{uuid.uuid4().hex}.png")
         try:
-            import fitz  # PyMuPDF
+            pix.save(str(tmp_path))
+            os.replace(tmp_path, thumbnail_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+    finally:
+        pdf_document.close()
 
-            # Open PDF
-            pdf_document = fitz.open(paper.pdf_path)
 
-            # Get first page
-            first_page = pdf_document[0]
+# Rendered thumbnails by PDF path, so repeat hits from the paper grid skip
+# the PDF stat and the thumbnails mkdir. The PNG itself is still checked on
+# every hit, since it can be removed from disk
+_THUMBNAIL_PATH_CACHE_SIZE = 4096
+_thumbnail_paths: "OrderedDict[str, Path]" = OrderedDict()
 
-            # Render page to image (matrix for zoom/resolution)
-            zoom = 2.0  # Zoom factor for higher quality
-            mat = fitz.Matrix(zoom, zoom)
-            pix = first_page.get_pixmap(matrix=mat)
+# Thumbnail renders in flight, so concurrent requests share one render
+_thumbnail_renders: Dict[Path, "asyncio.Future[None]"] = {}
 
-            # Save as PNG
-            pix.save(str(thumbnail_path))
 
-            pdf_document.close()
-        except Exception as e:
-            # If thumbnail generation fails, return 500
-            raise HTTPException(status_code=500, detail=f"Failed to generate thumbnail: {str(e)}")
+async def _ensure_thumbnail(pdf_path: str, thumbnail_path: Path) -> None:
+    """Render a thumbnail, joining an in-flight render of the same file"""
+    render = _thumbnail_renders.get(thumbnail_path)
+    if render is None:
+        # Rendering is CPU-bound, keep it off the event loop
+        render = asyncio.ensure_future(run_in_threadpool(_render_thumbnail, pdf_path, thumbnail_path))
+        _thumbnail_renders[thumbnail_path] = render
+        render.add_done_callback(lambda _: _thumbnail_renders.pop(thumbnail_path, None))
+
+    # Shield so one client disconnecting doesn't cancel the render for the others
+    await asyncio.shield(render)
+
+
+@router.get("/{paper_id}/thumbnail")
+async def get_paper_thumbnail(
+    paper_id: int,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """Get or generate a thumbnail for a paper's PDF"""
+    paper_exists, stored_pdf_path = await run_in_threadpool(
+        paper_crud.get_paper_pdf_path, db=db, paper_id=paper_id
+    )
+    if not paper_exists:
+        raise HTTPException(status_code=404, detail="Paper not found")
+
+    if not stored_pdf_path:
+        raise HTTPException(status_code=404, detail="Paper does not have a PDF file")
+
+    # Stored PDF names are unique per upload, so they identify the thumbnail
+    pdf_filename = Path(stored_pdf_path).stem
+    headers = {"ETag": f'"{pdf_filename}"', "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    thumbnail_path = _thumbnail_paths.get(stored_pdf_path)
+    if thumbnail_path is not None and thumbnail_path.exists():
+        _thumbnail_paths.move_to_end(stored_pdf_path)
+    else:
+        # Not remembered yet, or the file is gone and must be rendered again
+        _thumbnail_paths.pop(stored_pdf_path, None)
+
+        # Check if PDF file exists
+        pdf_path = paper_crud.resolve_pdf_path(stored_pdf_path)
+        if not pdf_path.exists():
+            raise HTTPException(status_code=404, detail="PDF file not found")
+
+        # Generate thumbnail path
+        upload_dir = Path(settings.UPLOAD_DIR)
+        thumbnails_dir = upload_dir / "thumbnails"
+        thumbnails_dir.mkdir(exist_ok=True)
+
+        thumbnail_path = thumbnails_dir / f"{pdf_filename}.png"
+
+        # Generate thumbnail if it doesn't exist, or join a render still in flight
+        if thumbnail_path in _thumbnail_renders or not thumbnail_path.exists():
+            try:
+                await _ensure_thumbnail(str(pdf_path), thumbnail_path)
+            except Exception as e:
+                # If thumbnail generation fails, return 500
+                raise HTTPException(status_code=500, detail=f"Failed to generate thumbnail: {str(e)}")
 
-    if not thumbnail_path.exists():
-        raise HTTPException(status_code=500, detail="Failed to generate thumbnail")
+        if not thumbnail_path.exists():
+            raise HTTPException(status_code=500, detail="Failed to generate thumbnail")
+
+        _thumbnail_paths[stored_pdf_path] = thumbnail_path
+        if len(_thumbnail_paths) > _THUMBNAIL_PATH_CACHE_SIZE:
+            _thumbnail_paths.popitem(last=False)
 
     return FileResponse(
         thumbnail_path,
         media_type="image/png",
-        filename=f"paper_{paper_id}_thumbnail.png"
+        filename=f"paper_{paper_id}_thumbnail.png",
+        headers=headers
     )
 
 
@@ -282,31 +387,25 @@ async def generate_paper_abstract(
     db: Session = Depends(get_db)
 ):
     """Generate abstract for a paper using LLM"""
-    paper = paper_crud.get_paper(db=db, paper_id=paper_id)
-    if not paper:
+    paper_exists, stored_pdf_path = await run_in_threadpool(
+        paper_crud.get_paper_pdf_path, db=db, paper_id=paper_id
+    )
+    if not paper_exists:
         raise HTTPException(status_code=404, detail="Paper not found")
     
-    if not paper.pdf_path:
+    if not stored_pdf_path:
         raise HTTPException(status_code=400, detail="Paper does not have a PDF file")
     
     try:
-        # Extract text from PDF
-        from ..services.pdf_processor import extract_text_from_pdf_file
-        from pathlib import Path
-        
         # Convert to absolute path
-        pdf_path = Path(paper.pdf_path)
-        if not pdf_path.is_absolute():
-            from ..core.config import settings
-            pdf_path = Path(settings.UPLOAD_DIR) / pdf_path.name
-        
+        pdf_path = paper_crud.resolve_pdf_path(stored_pdf_path)
         if not pdf_path.exists():
             raise HTTPException(status_code=404, detail="PDF file not found")
         
+        # Extract text from PDF
         text_content = await extract_text_from_pdf_file(str(pdf_path))
         
         # Generate abstract using LLM
-        from ..services.llm_service import get_llm_provider
         provider = get_llm_provider()
         
         abstract_prompt = """以下の学術論文から、簡潔で学術的なアブストラクト（要約）を日本語で生成してください。
@@ -322,12 +421,20 @@ async def generate_paper_abstract(
 学術的で客観的な文体で書いてください。
 """
         
-        abstract = await provider.generate_summary(text_content, abstract_prompt)
+        # Same text, prompt and model give the same abstract; skip the LLM on a repeat
+        cache_key = summary_cache_crud.summary_cache_key(
+            text_content, abstract_prompt, get_llm_model_name()
+        )
+        abstract = await run_in_threadpool(summary_cache_crud.get_cached_summary, db, cache_key)
+        if abstract is None:
+            abstract = await provider.generate_summary(text_content, abstract_prompt)
+            await run_in_threadpool(summary_cache_crud.put_cached_summary, db, cache_key, abstract)
         
         # Update paper with generated abstract
-        from ..schemas.paper import PaperUpdate
-        paper_update = PaperUpdate(abstract=abstract)
-        updated_paper = paper_crud.update_paper(db=db, paper_id=paper_id, paper_update=paper_update)
+        paper_update = paper_schema.PaperUpdate(abstract=abstract)
+        updated_paper = await run_in_threadpool(
+            paper_crud.update_paper, db=db, paper_id=paper_id, paper_update=paper_update
+        )
         
         return {
             "message": "Abstract generated successfully", 
@@ -335,6 +442,9 @@ async def generate_paper_abstract(
             "paper_id": paper_id
         }
         
+    except HTTPException:
+        # Re-raise HTTPExceptions as-is
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate abstract: {str(e)}")
 
@@ -346,33 +456,74 @@ async def generate_paper_summary(
     db: Session = Depends(get_db)
 ):
     """Start summary generation job for a paper"""
-    paper = paper_crud.get_paper(db=db, paper_id=paper_id)
+    paper = await run_in_threadpool(paper_crud.get_paper, db=db, paper_id=paper_id)
     if not paper:
         raise HTTPException(status_code=404, detail="Paper not found")
     
-    try:
-        # Create background job
-        parameters = {}
-        if request.custom_prompt:
-            parameters["custom_prompt"] = request.custom_prompt
-            
-        job = job_crud.create_job(
-            db=db,
-            job_type="summary_generation",
-            paper_id=paper_id,
-            parameters=parameters
-        )
+    # Create background job
+    parameters = {}
+    if request.custom_prompt:
+        parameters["custom_prompt"] = request.custom_prompt
+        
+    job = await run_in_threadpool(
+        job_crud.create_job,
+        db=db,
+        job_type="summary_generation",
+        paper_id=paper_id,
+        parameters=parameters
+    )
 
-        # Note: Background task processing removed - implement if needed
+    # Note: Background task processing removed - implement if needed
 
-        return job_schema.SummaryJobResponse(
-            job_id=job.id,
-            status="pending",
-            message="要約生成を開始しました。進行状況はジョブ状態APIで確認できます。"
-        )
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to start summary generation: {str(e)}")
+    return job_schema.SummaryJobResponse(
+        job_id=job.id,
+        status="pending",
+        message="要約生成を開始しました。進行状況はジョブ状態APIで確認できます。"
+    )
+
+
+@router.post("/{paper_id}/summary/stream")
+async def stream_paper_summary(
+    paper_id: int,
+    request: job_schema.SummaryJobCreate,
+    db: Session = Depends(get_db)
+):
+    """Generate a summary and stream it as server-sent events while it is written
+
+    Each chunk is sent as a `data` event; the paper is updated once with the
+    full text and a final `done` event is sent (or `error` on failure).
+    """
+    paper = await run_in_threadpool(paper_crud.get_paper, db=db, paper_id=paper_id)
+    if not paper:
+        raise HTTPException(status_code=404, detail="Paper not found")
+
+    async def events():
+        # The request session is closed once the response starts, so use our own
+        stream_db = SessionLocal()
+        try:
+            chunks = []
+            async for chunk in stream_summary(paper, custom_prompt=request.custom_prompt, db_session=stream_db):
+                chunks.append(chunk)
+                yield b"data: " + orjson.dumps({"text": chunk}) + b"\n\n"
+
+            summary = "".join(chunks).strip()
+            await run_in_threadpool(
+                paper_crud.update_paper,
+                db=stream_db,
+                paper_id=paper_id,
+                paper_update=paper_schema.PaperUpdate(summary=summary)
+            )
+            yield b"event: done\ndata: " + orjson.dumps({"paper_id": paper_id}) + b"\n\n"
+        except Exception as e:
+            yield b"event: error\ndata: " + orjson.dumps({"detail": str(e)}) + b"\n\n"
+        finally:
+            stream_db.close()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 @router.post("/{paper_id}/tags/{tag_id}")
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 from typing import List
 
@@ -8,6 +9,9 @@ from ..crud import tag as tag_crud
 
 router = APIRouter()
 
+# Validates ORM rows and dumps them to JSON bytes in a single pass
+_TagListAdapter = TypeAdapter(List[tag_schema.Tag])
+
 
 @router.get("/", response_model=List[tag_schema.Tag])
 def get_tags(
@@ -17,7 +21,8 @@ def get_tags(
 ):
     """Get all tags"""
     tags = tag_crud.get_tags(db=db, skip=skip, limit=limit)
-    return tags
+    tag_list = _TagListAdapter.validate_python(tags, from_attributes=True)
+    return Response(_TagListAdapter.dump_json(tag_list), media_type="application/json")
 
 
 @router.post("/", response_model=tag_schema.Tag)
@@ -2,12 +2,18 @@ try:
     from pydantic_settings import BaseSettings
 except ImportError:
     from pydantic import BaseSettings
+from functools import lru_cache
 from pathlib import Path
 
 
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite:///./data/theke.db"
+    DB_POOL_SIZE: int = 20  # Matches the threadpool running sync endpoints
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = False  # Only useful for server databases
     
     # File Upload
     UPLOAD_DIR: str = "./uploads"
@@ -19,6 +25,8 @@ class Settings(BaseSettings):
     LLM_PROVIDER: str = "openai"  # "openai" or "anthropic"
     DEFAULT_MODEL: str = "gpt-4"
     ANTHROPIC_MODEL: str = "claude-3-5-sonnet-20241022"
+    LLM_MAX_CONCURRENCY: int = 4  # Simultaneous requests to the LLM provider
+    LLM_REQUESTS_PER_MINUTE: int = 50
     SUMMARY_PROMPT: str = "Please provide a concise summary of this academic paper in Japanese, focusing on the main research question, methodology, key findings, and implications."
     
     # External APIs
@@ -33,4 +41,10 @@ class Settings(BaseSettings):
         env_file = ".env"
 
 
-settings = Settings()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Parse the environment and .env once; usable as a FastAPI dependency"""
+    return Settings()
+
+
+settings = get_settings()
@@ -1,6 +1,9 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 from pathlib import Path
 
 from .config import settings
@@ -9,11 +12,34 @@ from .config import settings
 data_dir = Path("data")
 data_dir.mkdir(exist_ok=True)
 
+_database_url = make_url(settings.DATABASE_URL)
+_pool_options = {"pool_recycle": settings.DB_POOL_RECYCLE, "pool_pre_ping": settings.DB_POOL_PRE_PING}
+# Sizing options only apply to QueuePool; in-memory SQLite uses SingletonThreadPool
+if issubclass(_database_url.get_dialect().get_pool_class(_database_url), QueuePool):
+    _pool_options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+
 engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False}  # SQLite specific
+    _database_url,
+    connect_args={"check_same_thread": False},  # SQLite specific
+    **_pool_options,
 )
 
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """WAL lets readers run while a write commits; NORMAL sync is safe under WAL"""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-16000")  # 16 MB page cache per connection
+        cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB
+        cursor.close()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -28,6 +54,70 @@ def get_db():
         db.close()
 
 
+# Full-text index over the searchable paper columns, kept in sync by triggers.
+# The trigram tokenizer matches substrings like the LIKE '%term%' filters it
+# replaces, and works for Japanese text without word boundaries.
+PAPER_FTS_COLUMNS = ("title", "authors", "abstract", "summary", "notes", "doi", "journal")
+_PAPER_FTS_COLUMN_LIST = ", ".join(PAPER_FTS_COLUMNS)
+
+
+def _paper_fts_values(row: str) -> str:
+    # Authors are stored as JSON with non-ASCII escaped; index the decoded names
+    return ", ".join(
+        f"(SELECT group_concat(value, ' ') FROM json_each({row}.authors))"
+        if column == "authors" else f"{row}.{column}"
+        for column in PAPER_FTS_COLUMNS
+    )
+
+
+_PAPER_FTS_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5({_PAPER_FTS_COLUMN_LIST}, tokenize='trigram')",
+    f"""CREATE TRIGGER IF NOT EXISTS papers_fts_insert AFTER INSERT ON papers BEGIN
+        INSERT INTO papers_fts(rowid, {_PAPER_FTS_COLUMN_LIST}) VALUES (new.id, {_paper_fts_values("new")});
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS papers_fts_delete AFTER DELETE ON papers BEGIN
+        DELETE FROM papers_fts WHERE rowid = old.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS papers_fts_update AFTER UPDATE OF {_PAPER_FTS_COLUMN_LIST} ON papers BEGIN
+        DELETE FROM papers_fts WHERE rowid = old.id;
+        INSERT INTO papers_fts(rowid, {_PAPER_FTS_COLUMN_LIST}) VALUES (new.id, {_paper_fts_values("new")});
+    END""",
+)
+
+# Set by create_tables; False when SQLite lacks FTS5 or the trigram tokenizer
+paper_fts_enabled = False
+
+
+def _create_paper_fts() -> bool:
+    try:
+        with engine.begin() as conn:
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'papers_fts'")
+            ).first()
+            for statement in _PAPER_FTS_DDL:
+                conn.execute(text(statement))
+            if not exists:
+                # Index papers created before the full-text table existed
+                conn.execute(text(
+                    f"INSERT INTO papers_fts(rowid, {_PAPER_FTS_COLUMN_LIST}) "
+                    f"SELECT id, {_paper_fts_values('papers')} FROM papers"
+                ))
+    except OperationalError as e:
+        print(f"Full-text search unavailable, falling back to LIKE filters: {e}")
+        return False
+    return True
+
+
 def create_tables():
     """Create all database tables"""
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    global paper_fts_enabled
+
+    Base.metadata.create_all(bind=engine)
+
+    # create_all skips existing tables, so add indexes introduced since they were created
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+    if engine.dialect.name == "sqlite":
+        paper_fts_enabled = _create_paper_fts()
\ No newline at end of file
@@ -1,3 +1,4 @@
+from sqlalchemy import delete
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
@@ -27,7 +28,6 @@ def create_citation(db: Session, citation: CitationCreate) -> Citation:
     db_citation = Citation(**citation.model_dump())
     db.add(db_citation)
     db.commit()
-    db.refresh(db_citation)
     return db_citation
 
 
@@ -42,7 +42,6 @@ def update_citation(db: Session, citation_id: int, citation_update: CitationUpda
         setattr(db_citation, field, value)
     
     db.commit()
-    db.refresh(db_citation)
     return db_citation
 
 
@@ -59,74 +58,88 @@ def delete_citation(db: Session, citation_id: int) -> bool:
 
 def delete_citations_by_paper(db: Session, paper_id: int) -> int:
     """Delete all citations for a specific paper and return count of deleted citations"""
-    citations = db.query(Citation).filter(Citation.citing_paper_id == paper_id).all()
-    count = len(citations)
-    
-    for citation in citations:
-        db.delete(citation)
-    
+    # Citations have no dependent rows, so one DELETE replaces loading and deleting each
+    result = db.execute(delete(Citation).where(Citation.citing_paper_id == paper_id))
     db.commit()
-    return count
+    return result.rowcount
+
+
+def _label(title: str) -> str:
+    return title if len(title) <= 50 else f"{title[:50]}..."
+
+
+def _paper_node(paper) -> GraphNode:
+    return {
+        "id": f"paper_{paper.id}",
+        "label": _label(paper.title),
+        "type": "paper",
+        "resolved": True,
+        "data": {
+            "id": paper.id,
+            "title": paper.title,
+            "authors": paper.authors,
+            "year": paper.year
+        }
+    }
+
+
+def _citation_node(citation) -> GraphNode:
+    return {
+        "id": f"citation_{citation.id}",
+        "label": _label(citation.cited_title),
+        "type": "citation",
+        "resolved": False,
+        "data": {
+            "id": citation.id,
+            "title": citation.cited_title,
+            "authors": citation.cited_authors,
+            "year": citation.cited_year
+        }
+    }
+
+
+def _citation_edge(citation) -> Optional[GraphEdge]:
+    if citation.cited_paper_id:
+        # Resolved citation
+        target = f"paper_{citation.cited_paper_id}"
+    elif citation.cited_title:
+        # Unresolved citation
+        target = f"citation_{citation.id}"
+    else:
+        return None
+
+    return {
+        "id": f"edge_{citation.id}",
+        "source": f"paper_{citation.citing_paper_id}",
+        "target": target,
+        "type": "citation"
+    }
 
 
 def get_citation_network(db: Session) -> CitationNetwork:
     """Get citation network data for graph visualization"""
-    papers = db.query(Paper).all()
-    citations = db.query(Citation).all()
+    # Only the columns the graph uses, as plain rows rather than ORM objects
+    papers = db.query(Paper.id, Paper.title, Paper.authors, Paper.year).all()
+    citations = db.query(
+        Citation.id,
+        Citation.citing_paper_id,
+        Citation.cited_paper_id,
+        Citation.cited_title,
+        Citation.cited_authors,
+        Citation.cited_year,
+    ).all()
     
-    # Create nodes
-    nodes = []
-    for paper in papers:
-        nodes.append({
-            "id": f"paper_{paper.id}",
-            "label": paper.title[:50] + "..." if len(paper.title) > 50 else paper.title,
-            "type": "paper",
-            "resolved": True,
-            "data": {
-                "id": paper.id,
-                "title": paper.title,
-                "authors": paper.authors,
-                "year": paper.year
-            }
-        })
-    
-    # Add unresolved citation nodes
-    unresolved_citations = [c for c in citations if c.cited_paper_id is None]
-    for citation in unresolved_citations:
-        if citation.cited_title:
-            nodes.append({
-                "id": f"citation_{citation.id}",
-                "label": citation.cited_title[:50] + "..." if len(citation.cited_title) > 50 else citation.cited_title,
-                "type": "citation",
-                "resolved": False,
-                "data": {
-                    "id": citation.id,
-                    "title": citation.cited_title,
-                    "authors": citation.cited_authors,
-                    "year": citation.cited_year
-                }
-            })
-    
-    # Create edges
+    nodes = [_paper_node(paper) for paper in papers]
     edges = []
+
+    # One pass over the citations emits unresolved citation nodes and all edges
     for citation in citations:
-        if citation.cited_paper_id:
-            # Resolved citation
-            edges.append({
-                "id": f"edge_{citation.id}",
-                "source": f"paper_{citation.citing_paper_id}",
-                "target": f"paper_{citation.cited_paper_id}",
-                "type": "citation"
-            })
-        elif citation.cited_title:
-            # Unresolved citation
-            edges.append({
-                "id": f"edge_{citation.id}",
-                "source": f"paper_{citation.citing_paper_id}",
-                "target": f"citation_{citation.id}",
-                "type": "citation"
-            })
-    
+        if citation.cited_paper_id is None and citation.cited_title:
+            nodes.append(_citation_node(citation))
+        edge = _citation_edge(citation)
+        if edge:
+            edges.append(edge)
+
     return {"nodes": nodes, "edges": edges}
 
 
@@ -144,5 +157,4 @@ def resolve_citation(db: Session, citation_id: int, cited_paper_id: int) -> Opti
     citation.status = "resolved"
     
     db.commit()
-    db.refresh(citation)
     return citation
\ No newline at end of file
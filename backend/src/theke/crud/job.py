@@ -1,8 +1,9 @@
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import case, delete, func, select, update
 from sqlalchemy.orm import Session
 from typing import Optional, List
-import json
+import orjson
 
 from ..models.job import Job
 
@@ -20,7 +21,7 @@ def create_job(
         id=job_id,
         type=job_type,
         paper_id=paper_id,
-        parameters=json.dumps(parameters) if parameters else None,
+        parameters=orjson.dumps(parameters).decode() if parameters else None,
         status="pending",
         progress=0
     )
@@ -54,33 +55,30 @@ def update_job_status(
     error_message: Optional[str] = None
 ) -> Optional[Job]:
     """Update job status and progress"""
-    job = get_job(db, job_id)
-    if not job:
-        return None
-    
-    job.status = status
+    values = {"status": status}
     
     if progress is not None:
-        job.progress = progress
+        values["progress"] = progress
         
     if progress_message is not None:
-        job.progress_message = progress_message
+        values["progress_message"] = progress_message
     
     if result is not None:
-        job.result = json.dumps(result)
+        values["result"] = orjson.dumps(result).decode()
     
     if error_message is not None:
-        job.error_message = error_message
+        values["error_message"] = error_message
     
-    # Set timestamps based on status
-    now = datetime.utcnow()
-    if status == "processing" and not job.started_at:
-        job.started_at = now
-    elif status in ["completed", "failed"] and not job.completed_at:
-        job.completed_at = now
+    # Set timestamps based on status, keeping the first one; the database supplies the time
+    if status == "processing":
+        values["started_at"] = case((Job.started_at.is_(None), func.now()), else_=Job.started_at)
+    elif status in ["completed", "failed"]:
+        values["completed_at"] = case((Job.completed_at.is_(None), func.now()), else_=Job.completed_at)
     
+    job = db.scalars(
+        update(Job).where(Job.id == job_id).values(**values).returning(Job)
+    ).one_or_none()
     db.commit()
-    db.refresh(job)
     return job
 
 
@@ -107,15 +105,23 @@ def get_pending_jobs(db: Session, job_type: Optional[str] = None) -> List[Job]:
     return query.order_by(Job.created_at).all()
 
 
-def cleanup_old_jobs(db: Session, days: int = 30) -> int:
-    """Delete jobs older than specified days"""
-    from datetime import timedelta
-    cutoff_date = datetime.utcnow() - timedelta(days=days)
-    
-    deleted_count = db.query(Job).filter(
-        Job.created_at < cutoff_date,
-        Job.status.in_(["completed", "failed"])
-    ).delete()
+def cleanup_old_jobs(db: Session, days: int = 30, batch_size: int = 1000) -> int:
+    """Delete jobs older than specified days
+
+    Deletes in batches, committing after each, so the write lock is never
+    held for a long time on a large jobs table.
+    """
+    cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
+    batch = (
+        select(Job.id)
+        .where(Job.status.in_(["completed", "failed"]), Job.created_at < cutoff_date)
+        .limit(batch_size)
+    )
     
-    db.commit()
-    return deleted_count
\ No newline at end of file
+    deleted_count = 0
+    while True:
+        result = db.execute(delete(Job).where(Job.id.in_(batch)))
+        db.commit()
+        deleted_count += result.rowcount
+        if result.rowcount < batch_size:
+            return deleted_count
\ No newline at end of file
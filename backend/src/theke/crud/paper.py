@@ -1,20 +1,79 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import and_, or_, text, desc, asc, func
-from typing import List, Optional, Literal
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from typing import Any, List, Optional, Literal, Tuple
 from pathlib import Path
 import aiofiles
+import re
 import uuid
 from datetime import datetime
 
 from ..models.paper import Paper
+from ..models.paper_tag import paper_tags
 from ..models.tag import Tag
 from ..schemas.paper import PaperCreate, PaperUpdate
 from ..core.config import settings
+from ..core import database
+
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _normalize_term(term: Optional[str]) -> Optional[str]:
+    """Collapse whitespace in a search term; blank terms become None"""
+    if not term:
+        return None
+    return _WHITESPACE_RE.sub(" ", term).strip() or None
+
+
+def _fts_filter(term: str, param: str, column: Optional[str] = None):
+    """Match papers through the papers_fts trigram index, or None if it can't be used
+
+    The trigram tokenizer only matches terms of three or more characters;
+    shorter terms keep using LIKE.
+    """
+    if not database.paper_fts_enabled or len(term) < 3:
+        return None
+    # Quote as an FTS5 phrase so the term is matched literally as a substring
+    match = '"' + term.replace('"', '""') + '"'
+    if column:
+        match = f"{column} : {match}"
+    return text(
+        f"papers.id IN (SELECT rowid FROM papers_fts WHERE papers_fts MATCH :{param})"
+    ).params(**{param: match})
+
+
+# Match decoded author names; the stored JSON escapes non-ASCII characters
+_AUTHOR_LIKE_SQL = "EXISTS (SELECT 1 FROM json_each(papers.authors) WHERE value LIKE :{param})"
+
+
+# Sortable columns by name, resolved once instead of via getattr per request
+_SORT_COLUMNS = {column.key: getattr(Paper, column.key) for column in Paper.__table__.columns}
 
 
 def get_paper(db: Session, paper_id: int) -> Optional[Paper]:
-    """Get a single paper by ID"""
-    return db.query(Paper).filter(Paper.id == paper_id).first()
+    """Get a single paper by ID
+
+    Uses the session identity map, so repeated lookups within a request
+    don't hit the database again, and eager-loads tags for serialization.
+    """
+    return db.get(Paper, paper_id, options=[selectinload(Paper.tags)])
+
+
+def get_paper_pdf_path(db: Session, paper_id: int) -> Tuple[bool, Optional[str]]:
+    """Return whether a paper exists and its stored PDF path, loading only that column"""
+    row = db.query(Paper.pdf_path).filter(Paper.id == paper_id).first()
+    if row is None:
+        return False, None
+    return True, row.pdf_path
+
+
+def resolve_pdf_path(pdf_path: str) -> Path:
+    """Resolve a stored PDF path against the upload directory"""
+    path = Path(pdf_path)
+    if not path.is_absolute():
+        path = Path(settings.UPLOAD_DIR) / path.name
+    return path
 
 
 def get_papers(
@@ -29,11 +88,22 @@ def get_papers(
     year_to: Optional[int] = None,
     has_summary: Optional[bool] = None,
     has_pdf: Optional[bool] = None,
-    author: Optional[str] = None
-) -> tuple[List[Paper], int]:
-    """Get papers with advanced filtering, sorting, and search"""
+    author: Optional[str] = None,
+    include_total: bool = True
+) -> tuple[List[Paper], Optional[int], bool]:
+    """Get papers with advanced filtering, sorting, and search
+
+    Returns the page, the total match count and whether more papers follow.
+    The total comes from a window count in the page query. With
+    include_total=False it is skipped (total is None) and has_more comes
+    from fetching one extra row instead.
+    """
     query = db.query(Paper)
     count_query = db.query(func.count(Paper.id))
+
+    # Blank terms would otherwise run the LIKE scans without narrowing anything
+    search = _normalize_term(search)
+    author = _normalize_term(author)
     
     # Apply filters to both queries
     filters = []
@@ -70,17 +140,21 @@ def get_papers(
     
     # Author filter
     if author:
-        author_term = f"%{author}%"
-        filters.append(
-            text("JSON_EXTRACT(authors, '$') LIKE :author").params(author=author_term)
-        )
+        author_filter = _fts_filter(author, "author", column="authors")
+        if author_filter is None:
+            author_term = f"%{author}%"
+            author_filter = text(_AUTHOR_LIKE_SQL.format(param="author")).params(author=author_term)
+        filters.append(author_filter)
     
-    # Search in title, authors, abstract, summary, notes
-    if search:
+    # Search in title, authors, abstract, summary, notes, DOI and journal
+    search_filter = _fts_filter(search, "search") if search else None
+    if search_filter is not None:
+        filters.append(search_filter)
+    elif search:
         search_term = f"%{search}%"
         search_filter = or_(
             Paper.title.ilike(search_term),
-            text("JSON_EXTRACT(authors, '$') LIKE :search").params(search=search_term),
+            text(_AUTHOR_LIKE_SQL.format(param="search")).params(search=search_term),
             Paper.abstract.ilike(search_term),
             Paper.summary.ilike(search_term),
             Paper.notes.ilike(search_term),
@@ -94,20 +168,24 @@ def get_papers(
         query = query.filter(and_(*filters))
         count_query = count_query.filter(and_(*filters))
     
-    # Get total count
-    total_count = count_query.scalar()
-    
     # Apply sorting
-    sort_column = getattr(Paper, sort_by, Paper.updated_at)
-    if sort_order == "desc":
-        query = query.order_by(desc(sort_column))
-    else:
-        query = query.order_by(asc(sort_column))
+    sort_column = _SORT_COLUMNS.get(sort_by, Paper.updated_at)
+    query = query.order_by(desc(sort_column) if sort_order == "desc" else asc(sort_column))
     
-    # Apply pagination
-    papers = query.offset(skip).limit(limit).all()
-    
-    return papers, total_count
+    # Apply pagination; tags are loaded in one extra query for the whole page
+    query = query.options(selectinload(Paper.tags)).offset(skip)
+    if not include_total:
+        papers = query.limit(limit + 1).all()
+        return papers[:limit], None, len(papers) > limit
+
+    # COUNT(*) OVER () carries the total on every row, so one query returns both
+    rows = query.add_columns(func.count().over().label("total")).limit(limit).all()
+    if rows:
+        total_count = rows[0].total
+    else:
+        # A page past the end has no rows to carry the total
+        total_count = count_query.scalar()
+    return [row[0] for row in rows], total_count, skip + limit < total_count
 
 
 def create_paper(db: Session, paper: PaperCreate) -> Paper:
@@ -151,28 +229,36 @@ def delete_paper(db: Session, paper_id: int) -> bool:
     return True
 
 
-async def save_pdf_file(paper_id: int, file) -> str:
-    """Save uploaded PDF file"""
+async def spool_pdf_upload(file, content_hash: Optional[Any] = None, chunk_size: int = 1 << 20) -> Path:
+    """Stream an upload into the upload directory in fixed-size chunks
+
+    Each chunk is also fed to content_hash if given. store_spooled_pdf moves
+    the spool file into place; callers unlink it if the upload is abandoned.
+    """
+    upload_dir = Path(settings.UPLOAD_DIR)
+    upload_dir.mkdir(exist_ok=True)
+
+    spool_path = upload_dir / f".upload_{uuid.uuid4().hex}.part"
+    async with aiofiles.open(spool_path, 'wb') as f:
+        while chunk := await file.read(chunk_size):
+            if content_hash is not None:
+                content_hash.update(chunk)
+            await f.write(chunk)
+    return spool_path
+
+
+def store_spooled_pdf(paper_id: int, spool_path: Path, original_filename: str) -> str:
+    """Rename a spooled upload to its final name and return the stored path"""
     try:
-        upload_dir = Path(settings.UPLOAD_DIR)
-        upload_dir.mkdir(exist_ok=True)
-        
+        size = spool_path.stat().st_size
+        print(f"File content size: {size} bytes")
+        if not size:
+            raise ValueError(f"File content is empty for file: {original_filename}")
+
         # Generate unique filename
-        file_extension = Path(file.filename).suffix
+        file_extension = Path(original_filename).suffix
         filename = f"{paper_id}_{uuid.uuid4().hex}{file_extension}"
-        file_path = upload_dir / filename
-        
-        # Save file
-        async with aiofiles.open(file_path, 'wb') as f:
-            content = await file.read()
-            print(f"File content size: {len(content) if content else 0} bytes")
-            if not content:
-                raise ValueError(f"File content is empty for file: {file.filename}")
-            await f.write(content)
-        
-        # Verify file was saved
-        if not file_path.exists():
-            raise ValueError("File was not saved successfully")
+        spool_path.replace(spool_path.with_name(filename))
         
         # Return relative path for database storage (just the filename with directory name)
         upload_dir_name = Path(settings.UPLOAD_DIR).name
@@ -181,37 +267,45 @@ async def save_pdf_file(paper_id: int, file) -> str:
         return result_path
         
     except Exception as e:
-        print(f"Error in save_pdf_file: {str(e)}")
+        print(f"Error in store_spooled_pdf: {str(e)}")
         raise
 
 
+def _paper_and_tag_exist(db: Session, paper_id: int, tag_id: int) -> bool:
+    """Check both IDs in one query without loading either object"""
+    row = db.query(
+        db.query(Paper.id).filter(Paper.id == paper_id).exists(),
+        db.query(Tag.id).filter(Tag.id == tag_id).exists(),
+    ).one()
+    return all(row)
+
+
 def add_tag_to_paper(db: Session, paper_id: int, tag_id: int) -> bool:
     """Add a tag to a paper"""
-    paper = get_paper(db, paper_id)
-    tag = db.query(Tag).filter(Tag.id == tag_id).first()
-    
-    if not paper or not tag:
+    if not _paper_and_tag_exist(db, paper_id, tag_id):
         return False
-    
-    if tag not in paper.tags:
-        paper.tags.append(tag)
-        db.commit()
-    
+
+    # An existing link is left as is
+    db.execute(
+        sqlite_insert(paper_tags)
+        .values(paper_id=paper_id, tag_id=tag_id)
+        .on_conflict_do_nothing()
+    )
+    db.commit()
     return True
 
 
 def remove_tag_from_paper(db: Session, paper_id: int, tag_id: int) -> bool:
     """Remove a tag from a paper"""
-    paper = get_paper(db, paper_id)
-    tag = db.query(Tag).filter(Tag.id == tag_id).first()
-    
-    if not paper or not tag:
+    if not _paper_and_tag_exist(db, paper_id, tag_id):
         return False
-    
-    if tag in paper.tags:
-        paper.tags.remove(tag)
-        db.commit()
-    
+
+    db.execute(
+        paper_tags.delete().where(
+            paper_tags.c.paper_id == paper_id, paper_tags.c.tag_id == tag_id
+        )
+    )
+    db.commit()
     return True
 
 
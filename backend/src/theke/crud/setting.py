@@ -1,35 +1,75 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import select
-from typing import Optional
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from typing import Dict, Optional, Tuple
+import threading
+import time
 
+from ..core.config import settings as config_settings
 from ..models.setting import Setting
 
 
+# key -> (expiry, value); None values are cached too so missing keys aren't re-queried
+_setting_cache: Dict[str, Tuple[float, Optional[str]]] = {}
+_SETTING_CACHE_TTL = 60.0  # Bounds staleness when another process writes a setting
+_setting_cache_lock = threading.Lock()
+# Bumped by every write so a read that raced with it doesn't cache the old value
+_setting_cache_version = 0
+
+
+def _cache_setting(key: str, value: Optional[str]) -> None:
+    """Write a committed value through to the cache"""
+    global _setting_cache_version
+    with _setting_cache_lock:
+        _setting_cache_version += 1
+        _setting_cache[key] = (time.monotonic() + _SETTING_CACHE_TTL, value)
+
+
+def clear_setting_cache() -> None:
+    """Drop all cached setting values"""
+    global _setting_cache_version
+    with _setting_cache_lock:
+        _setting_cache_version += 1
+        _setting_cache.clear()
+
+
 def get_setting(db: Session, key: str) -> Optional[Setting]:
     """Get a setting by key"""
     return db.query(Setting).filter(Setting.key == key).first()
 
 
 def get_setting_value(db: Session, key: str, default: Optional[str] = None) -> Optional[str]:
-    """Get a setting value by key, return default if not found"""
-    setting = get_setting(db, key)
-    return setting.value if setting else default
+    """Get a setting value by key, return default if not found
+
+    Values are cached per process for a short TTL; writes through this module
+    update the cached entry as soon as they commit.
+    """
+    cached = _setting_cache.get(key)
+    now = time.monotonic()
+    if cached is not None and cached[0] > now:
+        value = cached[1]
+    else:
+        version = _setting_cache_version
+        value = db.query(Setting.value).filter(Setting.key == key).scalar()
+        with _setting_cache_lock:
+            if version == _setting_cache_version:
+                _setting_cache[key] = (now + _SETTING_CACHE_TTL, value)
+    return value if value is not None else default
 
 
 def create_or_update_setting(db: Session, key: str, value: str) -> Setting:
     """Create a new setting or update existing one"""
-    setting = get_setting(db, key)
-    
-    if setting:
-        # Update existing setting
-        setting.value = value
-    else:
-        # Create new setting
-        setting = Setting(key=key, value=value)
-        db.add(setting)
-    
+    # One UPSERT instead of SELECT then INSERT/UPDATE, which also can't race on the key
+    stmt = sqlite_insert(Setting).values(key=key, value=value)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["key"],
+        set_={"value": stmt.excluded.value, "updated_at": func.now()}
+    ).returning(Setting)
+    # Overwrite a Setting already loaded in this session with the returned row
+    setting = db.scalars(stmt.execution_options(populate_existing=True)).one()
+
     db.commit()
-    db.refresh(setting)
+    _cache_setting(key, value)
     return setting
 
 
@@ -39,6 +79,7 @@ def delete_setting(db: Session, key: str) -> bool:
     if setting:
         db.delete(setting)
         db.commit()
+        _cache_setting(key, None)
         return True
     return False
 
@@ -50,8 +91,6 @@ def get_all_settings(db: Session) -> list[Setting]:
 
 def initialize_default_settings(db: Session):
     """Initialize default settings if they don't exist"""
-    from ..core.config import settings as config_settings
-    
     # Check if summary_prompt setting exists, if not create it with default value
     if not get_setting(db, "summary_prompt"):
         create_or_update_setting(
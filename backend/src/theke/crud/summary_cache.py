@@ -0,0 +1,27 @@
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from typing import Optional
+import hashlib
+
+from ..models.summary_cache import SummaryCache
+
+
+def summary_cache_key(text: str, prompt: str, model: str) -> str:
+    """Key a generated summary by everything that determines it"""
+    digest = hashlib.sha256()
+    for part in (model, prompt, text):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def get_cached_summary(db: Session, key: str) -> Optional[str]:
+    """Get a previously generated summary, or None"""
+    return db.query(SummaryCache.summary).filter(SummaryCache.key == key).scalar()
+
+
+def put_cached_summary(db: Session, key: str, summary: str) -> None:
+    """Store a generated summary, replacing any previous one for the key"""
+    stmt = sqlite_insert(SummaryCache).values(key=key, summary=summary)
+    db.execute(stmt.on_conflict_do_update(index_elements=["key"], set_={"summary": summary}))
+    db.commit()
@@ -25,7 +25,6 @@ def create_tag(db: Session, tag: TagCreate) -> Tag:
     db_tag = Tag(**tag.model_dump())
     db.add(db_tag)
     db.commit()
-    db.refresh(db_tag)
     return db_tag
 
 
@@ -40,7 +39,6 @@ def update_tag(db: Session, tag_id: int, tag_update: TagUpdate) -> Optional[Tag]
         setattr(db_tag, field, value)
     
     db.commit()
-    db.refresh(db_tag)
     return db_tag
 
 
@@ -1,18 +1,25 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from pathlib import Path
+from sqlalchemy.exc import SQLAlchemyError
 import asyncio
 
 from .api import papers, tags, settings as settings_api
 from .core.config import settings
-from .core.database import create_tables
+from .core.database import create_tables, get_db
+from .crud.setting import initialize_default_settings
+from .services.llm_service import close_llm_providers
 
 app = FastAPI(
     title="Theke Backend",
     description="Backend API for Theke paper management system",
-    version="0.1.0"
+    version="0.1.0",
+    # Render JSON bodies with orjson instead of the stdlib encoder
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -24,6 +31,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON responses such as paper lists with abstracts and summaries
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Middleware to handle long-running requests
 @app.middleware("http")
 async def timeout_middleware(request, call_next):
@@ -34,7 +44,6 @@ async def timeout_middleware(request, call_next):
             response = await asyncio.wait_for(call_next(request), timeout=600.0)
             return response
         except asyncio.TimeoutError:
-            from fastapi import HTTPException
             raise HTTPException(status_code=504, detail="要約生成がタイムアウトしました。論文が長すぎるか、LLMサービスが応答していません。")
     else:
         # Normal timeout for other endpoints
@@ -42,10 +51,15 @@ async def timeout_middleware(request, call_next):
             response = await asyncio.wait_for(call_next(request), timeout=30.0)
             return response
         except asyncio.TimeoutError:
-            from fastapi import HTTPException
             raise HTTPException(status_code=504, detail="リクエストがタイムアウトしました。")
 
 
+@app.exception_handler(SQLAlchemyError)
+async def sqlalchemy_error_handler(request: Request, exc: SQLAlchemyError):
+    """Return a 500 for database errors; get_db closes the session, rolling back"""
+    return ORJSONResponse(status_code=500, content={"detail": f"Database error: {exc.__class__.__name__}"})
+
+
 # Static files for uploads
 uploads_path = Path(settings.UPLOAD_DIR)
 uploads_path.mkdir(exist_ok=True)
@@ -62,15 +76,18 @@ async def startup_event():
     create_tables()
     
     # Initialize default settings
-    from .core.database import get_db
-    from .crud.setting import initialize_default_settings
-    
     db = next(get_db())
     try:
         initialize_default_settings(db)
     finally:
         db.close()
 
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release shared HTTP clients"""
+    await close_llm_providers()
+
 @app.get("/")
 async def root():
     return {"message": "Theke Backend API", "version": "0.1.0"}
@@ -4,5 +4,6 @@ from .citation import Citation
 from .paper_tag import PaperTag
 from .setting import Setting
 from .job import Job
+from .summary_cache import SummaryCache
 
-__all__ = ["Paper", "Tag", "Citation", "PaperTag", "Setting", "Job"]
\ No newline at end of file
+__all__ = ["Paper", "Tag", "Citation", "PaperTag", "Setting", "Job", "SummaryCache"]
\ No newline at end of file
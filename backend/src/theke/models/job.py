@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..core.database import Base
@@ -6,6 +6,10 @@ from ..core.database import Base
 
 class Job(Base):
     __tablename__ = "jobs"
+    __table_args__ = (
+        # Serves cleanup_old_jobs and the pending-job queue, both filtered by status
+        Index("ix_jobs_status_created_at", "status", "created_at"),
+    )
 
     id = Column(String, primary_key=True, index=True)  # UUID
     type = Column(String(50), nullable=False)  # "summary_generation", "citation_extraction", etc.
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, Table
+from sqlalchemy import Column, Integer, ForeignKey, Index, Table
 
 from ..core.database import Base
 
@@ -7,7 +7,9 @@ paper_tags = Table(
     'paper_tags',
     Base.metadata,
     Column('paper_id', Integer, ForeignKey('papers.id'), primary_key=True),
-    Column('tag_id', Integer, ForeignKey('tags.id'), primary_key=True)
+    Column('tag_id', Integer, ForeignKey('tags.id'), primary_key=True),
+    # The primary key leads with paper_id; this serves lookups and counts by tag
+    Index('ix_paper_tags_tag_id', 'tag_id')
 )
 
 # Alias for backward compatibility
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, DateTime, String, Text
+from sqlalchemy.sql import func
+
+from ..core.database import Base
+
+
+class SummaryCache(Base):
+    __tablename__ = "summary_cache"
+
+    # sha256 of (input text, prompt, model); see crud.summary_cache.summary_cache_key
+    key = Column(String(64), primary_key=True)
+    summary = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,11 +1,11 @@
-from .paper import Paper, PaperCreate, PaperUpdate, PaperInDB
+from .paper import Paper, PaperCreate, PaperUpdate, PaperInDB, PaperList
 from .tag import Tag, TagCreate, TagUpdate, TagInDB
 from .citation import Citation, CitationCreate, CitationUpdate, CitationInDB
 from .setting import Setting, SettingCreate, SettingUpdate, SummaryPromptResponse, SummaryPromptUpdate
 from .job import JobCreate, JobResponse, SummaryJobCreate, SummaryJobResponse
 
 __all__ = [
-    "Paper", "PaperCreate", "PaperUpdate", "PaperInDB",
+    "Paper", "PaperCreate", "PaperUpdate", "PaperInDB", "PaperList",
     "Tag", "TagCreate", "TagUpdate", "TagInDB", 
     "Citation", "CitationCreate", "CitationUpdate", "CitationInDB",
     "Setting", "SettingCreate", "SettingUpdate", "SummaryPromptResponse", "SummaryPromptUpdate",
@@ -7,6 +7,11 @@ from pydantic.types import PositiveInt
 from .tag import Tag
 
 
+VALID_EXTERNAL_ID_SOURCES = frozenset(
+    {'arxiv', 'pubmed', 'doi', 'semantic_scholar', 'crossref'}
+)
+
+
 class PaperBase(BaseModel):
     title: Annotated[str, Field(min_length=1, max_length=500, description="Paper title")]
     authors: Annotated[
@@ -73,9 +78,8 @@ class PaperBase(BaseModel):
     @model_validator(mode='after')
     def validate_external_ids(self) -> 'PaperBase':
         if self.external_ids:
-            valid_sources = {'arxiv', 'pubmed', 'doi', 'semantic_scholar', 'crossref'}
             for source in self.external_ids.keys():
-                if source not in valid_sources:
+                if source not in VALID_EXTERNAL_ID_SOURCES:
                     raise ValueError(f'Invalid external ID source: {source}')
         return self
 
@@ -112,3 +116,11 @@ class PaperInDB(PaperBase):
 
 class Paper(PaperInDB):
     pass
+
+
+class PaperList(BaseModel):
+    papers: List[Paper]
+    total: Optional[int] = None  # Omitted when the count was skipped
+    skip: int
+    limit: int
+    has_more: bool
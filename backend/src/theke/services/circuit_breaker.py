@@ -0,0 +1,41 @@
+import time
+
+
+class CircuitBreaker:
+    """Skip calls to a failing dependency for a cooldown after repeated failures
+
+    Closed: calls are allowed. After fail_threshold consecutive failures the
+    breaker opens and allow() returns False until reset_timeout seconds have
+    passed; then one trial call is let through per cooldown (half-open). A
+    success closes the breaker again.
+    """
+
+    def __init__(self, name: str, fail_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.fail_threshold = fail_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        return self._failures >= self.fail_threshold
+
+    def allow(self) -> bool:
+        """Return whether a call may be attempted now"""
+        if not self.is_open:
+            return True
+        now = time.monotonic()
+        if now - self._opened_at >= self.reset_timeout:
+            # Half-open: let this call through and restart the cooldown for the rest
+            self._opened_at = now
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self._failures = 0
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._failures == self.fail_threshold:
+            self._opened_at = time.monotonic()
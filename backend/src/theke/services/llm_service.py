@@ -1,16 +1,71 @@
 import asyncio
-from typing import Optional, Dict, Any, List
+import base64
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+import orjson
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, TypeVar
 from sqlalchemy.orm import Session
 
 from ..core.config import settings
+from ..crud.setting import get_setting_value
 from ..types import LLMServiceProtocol, ServiceError
 
 
+T = TypeVar("T")
+
+
+class LLMRateLimiter:
+    """Cap concurrent LLM requests and requests per sliding minute
+
+    The provider SDKs already retry 429s with exponential backoff; this keeps
+    bursts (several uploads or abstract generations at once) from causing
+    them in the first place.
+    """
+
+    def __init__(self, max_concurrency: int, requests_per_minute: int):
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._requests_per_minute = requests_per_minute
+        self._sent: Deque[float] = deque()
+        self._lock = asyncio.Lock()
+
+    async def _wait_for_slot(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                while self._sent and now - self._sent[0] >= 60.0:
+                    self._sent.popleft()
+                if len(self._sent) < self._requests_per_minute:
+                    self._sent.append(now)
+                    return
+                await asyncio.sleep(60.0 - (now - self._sent[0]))
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold a concurrency and rate slot, e.g. for the lifetime of a stream"""
+        async with self._semaphore:
+            await self._wait_for_slot()
+            yield
+
+    async def call(self, func: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        """Await func(*args, **kwargs) once a concurrency and rate slot is free"""
+        async with self.slot():
+            return await func(*args, **kwargs)
+
+
+llm_rate_limiter = LLMRateLimiter(settings.LLM_MAX_CONCURRENCY, settings.LLM_REQUESTS_PER_MINUTE)
+
+
 class LLMProvider(LLMServiceProtocol):
     """Base LLM provider implementation"""
     
     async def generate_summary(self, text: str, custom_prompt: Optional[str] = None, db_session: Optional[Session] = None) -> str:
         raise NotImplementedError
+
+    async def stream_summary(self, text: str, custom_prompt: Optional[str] = None, db_session: Optional[Session] = None) -> AsyncIterator[str]:
+        """Yield the summary in chunks; providers without streaming yield it whole"""
+        yield await self.generate_summary(text, custom_prompt=custom_prompt, db_session=db_session)
     
     async def extract_metadata(self, text: str) -> Dict[str, Any]:
         raise NotImplementedError
@@ -35,13 +90,13 @@ class OpenAIProvider(LLMProvider):
         if custom_prompt:
             prompt = custom_prompt
         elif db_session:
-            from ..crud.setting import get_setting_value
             prompt = get_setting_value(db_session, "summary_prompt", default=settings.SUMMARY_PROMPT)
         else:
             prompt = settings.SUMMARY_PROMPT
         
         try:
-            response = await self.client.chat.completions.create(
+            response = await llm_rate_limiter.call(
+                self.client.chat.completions.create,
                 model=settings.DEFAULT_MODEL,
                 messages=[
                     {"role": "system", "content": prompt},
@@ -53,6 +108,32 @@ class OpenAIProvider(LLMProvider):
             return response.choices[0].message.content.strip()
         except Exception as e:
             raise Exception(f"OpenAI API error: {str(e)}")
+
+    async def stream_summary(self, text: str, custom_prompt: Optional[str] = None, db_session: Optional[object] = None) -> AsyncIterator[str]:
+        if custom_prompt:
+            prompt = custom_prompt
+        elif db_session:
+            prompt = get_setting_value(db_session, "summary_prompt", default=settings.SUMMARY_PROMPT)
+        else:
+            prompt = settings.SUMMARY_PROMPT
+
+        try:
+            async with llm_rate_limiter.slot():
+                stream = await self.client.chat.completions.create(
+                    model=settings.DEFAULT_MODEL,
+                    messages=[
+                        {"role": "system", "content": prompt},
+                        {"role": "user", "content": f"以下の論文を要約してください:\n\n{text[:4000]}"}  # Limit text length
+                    ],
+                    max_tokens=1500,
+                    temperature=0.3,
+                    stream=True
+                )
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+        except Exception as e:
+            raise Exception(f"OpenAI API error: {str(e)}")
     
     async def extract_citations(self, text: str) -> list[Dict[str, Any]]:
         prompt = """Extract all citations from this academic paper text. 
@@ -60,7 +141,8 @@ class OpenAIProvider(LLMProvider):
         Only return the JSON, no other text."""
         
         try:
-            response = await self.client.chat.completions.create(
+            response = await llm_rate_limiter.call(
+                self.client.chat.completions.create,
                 model=settings.DEFAULT_MODEL,
                 messages=[
                     {"role": "system", "content": prompt},
@@ -70,13 +152,12 @@ class OpenAIProvider(LLMProvider):
                 temperature=0.1
             )
             
-            import json
             result = response.choices[0].message.content.strip()
             # Try to parse as JSON
             try:
-                citations = json.loads(result)
+                citations = orjson.loads(result)
                 return citations if isinstance(citations, list) else []
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 return []
                 
         except Exception as e:
@@ -99,20 +180,19 @@ class AnthropicProvider(LLMProvider):
         if custom_prompt:
             prompt = custom_prompt
         elif db_session:
-            from ..crud.setting import get_setting_value
             prompt = get_setting_value(db_session, "summary_prompt", default=settings.SUMMARY_PROMPT)
         else:
             prompt = settings.SUMMARY_PROMPT
 
         # Get model from database setting or use default
         if db_session:
-            from ..crud.setting import get_setting_value
             model = get_setting_value(db_session, "anthropic_model", default=settings.ANTHROPIC_MODEL)
         else:
             model = settings.ANTHROPIC_MODEL
 
         try:
-            message = await self.client.messages.create(
+            message = await llm_rate_limiter.call(
+                self.client.messages.create,
                 model=model,
                 max_tokens=1500,
                 temperature=0.3,
@@ -126,32 +206,60 @@ class AnthropicProvider(LLMProvider):
             return message.content[0].text.strip()
         except Exception as e:
             raise Exception(f"Anthropic API error: {str(e)}")
+
+    async def stream_summary(self, text: str, custom_prompt: Optional[str] = None, db_session: Optional[object] = None) -> AsyncIterator[str]:
+        if custom_prompt:
+            prompt = custom_prompt
+        elif db_session:
+            prompt = get_setting_value(db_session, "summary_prompt", default=settings.SUMMARY_PROMPT)
+        else:
+            prompt = settings.SUMMARY_PROMPT
+
+        if db_session:
+            model = get_setting_value(db_session, "anthropic_model", default=settings.ANTHROPIC_MODEL)
+        else:
+            model = settings.ANTHROPIC_MODEL
+
+        try:
+            async with llm_rate_limiter.slot():
+                async with self.client.messages.stream(
+                    model=model,
+                    max_tokens=1500,
+                    temperature=0.3,
+                    messages=[
+                        {
+                            "role": "user",
+                            "content": f"{prompt}\n\n以下の論文を要約してください:\n{text[:100000]}"
+                        }
+                    ]
+                ) as stream:
+                    async for chunk in stream.text_stream:
+                        yield chunk
+        except Exception as e:
+            raise Exception(f"Anthropic API error: {str(e)}")
     
     async def generate_summary_from_pdf(self, pdf_path: str, custom_prompt: Optional[str] = None, db_session: Optional[object] = None) -> str:
         """Generate summary directly from PDF using Anthropic's native PDF support"""
         if custom_prompt:
             prompt = custom_prompt
         elif db_session:
-            from ..crud.setting import get_setting_value
             prompt = get_setting_value(db_session, "summary_prompt", default=settings.SUMMARY_PROMPT)
         else:
             prompt = settings.SUMMARY_PROMPT
 
         # Get model from database setting or use default
         if db_session:
-            from ..crud.setting import get_setting_value
             model = get_setting_value(db_session, "anthropic_model", default=settings.ANTHROPIC_MODEL)
         else:
             model = settings.ANTHROPIC_MODEL
 
         try:
-            import base64
-
             # Read PDF file and encode as base64
             with open(pdf_path, 'rb') as f:
                 pdf_data = base64.b64encode(f.read()).decode('utf-8')
 
-            message = await self.client.messages.create(
+            message = await llm_rate_limiter.call(
+                self.client.messages.create,
                 model=model,
                 max_tokens=2000,
                 temperature=0.3,
@@ -186,13 +294,13 @@ class AnthropicProvider(LLMProvider):
 
         # Get model from database setting or use default
         if db_session:
-            from ..crud.setting import get_setting_value
             model = get_setting_value(db_session, "anthropic_model", default=settings.ANTHROPIC_MODEL)
         else:
             model = settings.ANTHROPIC_MODEL
 
         try:
-            message = await self.client.messages.create(
+            message = await llm_rate_limiter.call(
+                self.client.messages.create,
                 model=model,
                 max_tokens=2000,
                 temperature=0.1,
@@ -204,13 +312,12 @@ class AnthropicProvider(LLMProvider):
                 ]
             )
 
-            import json
             result = message.content[0].text.strip()
             # Try to parse as JSON
             try:
-                citations = json.loads(result)
+                citations = orjson.loads(result)
                 return citations if isinstance(citations, list) else []
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 return []
 
         except Exception as e:
@@ -240,19 +347,17 @@ class AnthropicProvider(LLMProvider):
 
         # Get model from database setting or use default
         if db_session:
-            from ..crud.setting import get_setting_value
             model = get_setting_value(db_session, "anthropic_model", default=settings.ANTHROPIC_MODEL)
         else:
             model = settings.ANTHROPIC_MODEL
 
         try:
-            import base64
-
             # Read PDF file and encode as base64
             with open(pdf_path, 'rb') as f:
                 pdf_data = base64.b64encode(f.read()).decode('utf-8')
 
-            message = await self.client.messages.create(
+            message = await llm_rate_limiter.call(
+                self.client.messages.create,
                 model=model,
                 max_tokens=3000,
                 temperature=0.1,
@@ -277,7 +382,6 @@ class AnthropicProvider(LLMProvider):
                 ]
             )
 
-            import json
             result = message.content[0].text.strip()
 
             # Remove markdown code blocks if present
@@ -288,9 +392,9 @@ class AnthropicProvider(LLMProvider):
                 result = result[4:].strip()
 
             try:
-                citations = json.loads(result)
+                citations = orjson.loads(result)
                 return citations if isinstance(citations, list) else []
-            except json.JSONDecodeError as e:
+            except orjson.JSONDecodeError as e:
                 print(f"JSON parsing error: {e}")
                 print(f"Raw result: {result}")
                 return []
@@ -299,19 +403,45 @@ class AnthropicProvider(LLMProvider):
             raise Exception(f"Anthropic PDF citation extraction error: {str(e)}")
 
 
+# Providers are reused across requests so their HTTP connection pools stay warm
+_providers: Dict[Tuple[str, str], LLMProvider] = {}
+
+
 def get_llm_provider() -> LLMProvider:
     """Get the configured LLM provider"""
     if settings.LLM_PROVIDER == "anthropic":
         if not settings.ANTHROPIC_API_KEY or settings.ANTHROPIC_API_KEY == "your_anthropic_api_key_here":
             raise ValueError("Anthropic API key is not configured. Please set ANTHROPIC_API_KEY in your .env file.")
-        return AnthropicProvider()
+        key = ("anthropic", settings.ANTHROPIC_API_KEY)
+        provider_class = AnthropicProvider
     elif settings.LLM_PROVIDER == "openai":
         if not settings.OPENAI_API_KEY or settings.OPENAI_API_KEY == "your_openai_api_key_here":
             raise ValueError("OpenAI API key is not configured. Please set OPENAI_API_KEY in your .env file.")
-        return OpenAIProvider()
+        key = ("openai", settings.OPENAI_API_KEY)
+        provider_class = OpenAIProvider
     else:
         raise ValueError(f"Unsupported LLM provider: {settings.LLM_PROVIDER}. Supported providers: openai, anthropic")
 
+    provider = _providers.get(key)
+    if provider is None:
+        provider = _providers[key] = provider_class()
+    return provider
+
+
+def get_llm_model_name() -> str:
+    """Identify the model used by get_llm_provider() calls made without a DB session"""
+    if settings.LLM_PROVIDER == "anthropic":
+        return f"anthropic:{settings.ANTHROPIC_MODEL}"
+    return f"{settings.LLM_PROVIDER}:{settings.DEFAULT_MODEL}"
+
+
+async def close_llm_providers() -> None:
+    """Close the HTTP clients of all cached LLM providers"""
+    providers = list(_providers.values())
+    _providers.clear()
+    for provider in providers:
+        await provider.client.close()
+
 
 async def generate_summary(paper, custom_prompt: Optional[str] = None, db_session: Optional[object] = None) -> str:
     """Generate a summary for a paper using the configured LLM provider"""
@@ -320,13 +450,26 @@ async def generate_summary(paper, custom_prompt: Optional[str] = None, db_sessio
     # If using Anthropic and PDF exists, use direct PDF summarization
     if isinstance(provider, AnthropicProvider) and paper.pdf_path:
         try:
-            import os
             if os.path.exists(paper.pdf_path):
                 return await provider.generate_summary_from_pdf(paper.pdf_path, custom_prompt=custom_prompt, db_session=db_session)
         except Exception as e:
             print(f"PDF summarization failed, falling back to text summarization: {e}")
     
     # Fallback to text-based summarization
+    text = await _summary_text(paper)
+    return await provider.generate_summary(text, custom_prompt=custom_prompt, db_session=db_session)
+
+
+async def stream_summary(paper, custom_prompt: Optional[str] = None, db_session: Optional[object] = None) -> AsyncIterator[str]:
+    """Stream a text-based summary for a paper as the provider generates it"""
+    provider = get_llm_provider()
+    text = await _summary_text(paper)
+    async for chunk in provider.stream_summary(text, custom_prompt=custom_prompt, db_session=db_session):
+        yield chunk
+
+
+async def _summary_text(paper) -> str:
+    """Collect the paper metadata and PDF text sent for summarization"""
     text_parts = []
     if paper.title:
         text_parts.append(f"Title: {paper.title}")
@@ -339,7 +482,7 @@ async def generate_summary(paper, custom_prompt: Optional[str] = None, db_sessio
     if paper.journal:
         text_parts.append(f"Journal: {paper.journal}")
     
-    # Add PDF text extraction for non-Anthropic providers
+    # Add text extracted from the PDF
     if paper.pdf_path:
         try:
             from .pdf_processor import extract_text_from_pdf_file
@@ -352,8 +495,7 @@ async def generate_summary(paper, custom_prompt: Optional[str] = None, db_sessio
     text = "\n\n".join(text_parts)
     if not text.strip():
         raise ValueError("No text content available for summarization")
-    
-    return await provider.generate_summary(text, custom_prompt=custom_prompt, db_session=db_session)
+    return text
 
 
 async def extract_citations_from_paper(paper, db_session: Optional[object] = None) -> list[Dict[str, Any]]:
@@ -363,7 +505,6 @@ async def extract_citations_from_paper(paper, db_session: Optional[object] = Non
     # If using Anthropic and PDF exists, use direct PDF extraction
     if isinstance(provider, AnthropicProvider) and paper.pdf_path:
         try:
-            import os
             if os.path.exists(paper.pdf_path):
                 return await provider.extract_citations_from_pdf(paper.pdf_path, db_session=db_session)
         except Exception as e:
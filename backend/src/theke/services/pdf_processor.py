@@ -1,96 +1,269 @@
+import asyncio
+import copy
+import hashlib
 import re
+from collections import OrderedDict
+from operator import itemgetter
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+import orjson
 import PyPDF2
 
-from .llm_service import get_llm_provider
+from .circuit_breaker import CircuitBreaker
+from .llm_service import get_llm_provider, llm_rate_limiter
+
+
+def _compile_any(patterns: tuple[str, ...]) -> "re.Pattern[str]":
+    """Combine patterns into one alternation so a line is scanned in a single pass"""
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+
+
+# Lookup tables for the text heuristics, built once at import instead of per call
+
+# Common header/footer patterns skipped when looking for a title
+_TITLE_SKIP_RE = _compile_any((
+    r'^(page\s+\d+|p\.\s*\d+)$',
+    r'^\d+$',
+    r'^[ivxlc]+$',  # Roman numerals
+    r'^(arxiv|doi|issn|isbn)',
+    r'^\w+\.(com|org|edu)',
+    r'^©.*\d{4}',
+    r'^published\s+in',
+    r'^proceedings\s+of',
+))
+
+# Common exclusion patterns for titles
+_TITLE_EXCLUDE_RE = _compile_any((
+    r'^(abstract|introduction|keywords|references|bibliography|contents?|acknowledgments?)',
+    r'^(table\s+of\s+contents|list\s+of)',
+    r'^(figure|table|equation)\s+\d+',
+    r'^(chapter|section)\s+\d+',
+    r'^\d+\.\s+',  # Numbered sections
+    r'@.*\.(com|org|edu)',  # Email addresses
+    r'(university|college|institute|department)',
+    r'^(received|accepted|published)',
+    r'^\*.*correspondence',
+))
+
+# Common title words used for scoring title candidates
+_TITLE_SCORE_INDICATORS = (
+    'analysis', 'study', 'investigation', 'review', 'survey', 'approach',
+    'method', 'algorithm', 'system', 'framework', 'model', 'towards', 'using',
+)
+
+# Skip patterns that are unlikely to contain author names
+_AUTHOR_SKIP_RE = _compile_any((
+    r'^(abstract|introduction|keywords|references|bibliography)',
+    r'^(page\s+\d+|p\.\s*\d+)$',
+    r'^\d+$',
+    r'^(arxiv|doi|issn|isbn)',
+    r'^©.*\d{4}',
+    r'^(received|accepted|published)',
+    r'^(table|figure|equation)\s+\d+',
+))
+
+_SPECIAL_CHAR_RE = re.compile(r'[0-9@#$%^&*()_+={}|<>?/\\]')
+_DIGIT_RE = re.compile(r'\d')
+_FULL_NAME_RE = re.compile(r'\b[A-Z][a-z]{2,}\s+[A-Z][a-z]{2,}\b')
+_INITIAL_NAME_RE = re.compile(r'\b[A-Z]\.\s*[A-Z][a-z]{2,}\b')
+_LETTER_RE = re.compile(r'[a-zA-Z]')
+_FIRST_LAST_NAME_RE = re.compile(r'^[A-Z][a-z]*\.?\s+([A-Z]\.?\s+)*[A-Z][a-z]+$')
+_LAST_FIRST_NAME_RE = re.compile(r'^[A-Z][a-z]+,\s+[A-Z][a-z]*\.?$')
+
+_AFFILIATION_INDICATORS = ('university', 'college', 'institute', 'department')
+
+_HEADER_WORDS = ('paper', 'article', 'journal', 'conference', 'proceedings', 'volume', 'issue')
+
+# Words suggesting a line is a title rather than author names
+_TITLE_INDICATORS = (
+    'analysis', 'study', 'investigation', 'review', 'survey', 'approach',
+    'method', 'algorithm', 'system', 'framework', 'model', 'towards',
+    'using', 'based', 'novel', 'improved', 'enhanced', 'automatic',
+    'efficient', 'robust', 'optimal', 'deep', 'machine', 'learning',
+    'detection', 'recognition', 'classification', 'prediction',
+    'optimization', 'evaluation', 'comparison', 'application',
+)
+
+# Prepositions and articles common in titles
+_TITLE_FUNCTION_WORDS = frozenset(
+    ('of', 'for', 'in', 'on', 'with', 'by', 'from', 'to', 'the', 'a', 'an')
+)
+
+# Academic/technical terms that are common in titles
+_ACADEMIC_TERMS = (
+    'research', 'experimental', 'theoretical', 'computational', 'statistical',
+    'mathematical', 'numerical', 'empirical', 'comparative', 'comprehensive',
+    'systematic', 'meta', 'multi', 'cross', 'inter', 'trans', 'bio', 'nano',
+    'micro', 'macro', 'quantum', 'neural', 'genetic', 'semantic', 'syntactic',
+)
+
+
+# Metadata extracted per (PDF content, filename, mode), so the second pass of
+# the extract-then-upload flow does not re-parse the PDF or re-query the LLM
+_METADATA_CACHE_SIZE = 128
+_metadata_cache: "OrderedDict[tuple[bytes, str, bool], Dict[str, Any]]" = OrderedDict()
+
+
+# Stops uploads from waiting on an LLM that keeps failing; they get the
+# same empty result a failed call would return, immediately
+_llm_breaker = CircuitBreaker("llm_metadata", fail_threshold=3, reset_timeout=60.0)
+
+# Leaves room within the 30 s request timeout to fall back and save the upload
+_LLM_METADATA_TIMEOUT = 20.0
+
+
+# Uploads are hashed and parsed in chunks of this size rather than read whole
+_UPLOAD_CHUNK_SIZE = 1 << 20
+
+
+def new_content_hash() -> Any:
+    """Hash object that digests PDF content for the metadata cache key"""
+    return hashlib.blake2b(digest_size=16)
 
 
 async def extract_metadata_from_pdf(file, use_llm: bool = False) -> Dict[str, Any]:
     """Extract metadata and text from uploaded PDF file"""
-    try:
-        # Read PDF content
-        content = await file.read()
+    # Hash the upload in chunks and parse from its spooled file, never holding it whole
+    content_hash = new_content_hash()
+    while chunk := await file.read(_UPLOAD_CHUNK_SIZE):
+        content_hash.update(chunk)
+
+    # Reset file pointer for parsing and potential reuse
+    await file.seek(0)
 
-        # Reset file pointer for potential reuse
-        await file.seek(0)
+    return await _extract_metadata(
+        file.file, content_hash.digest(), file.filename or "", use_llm=use_llm
+    )
 
-        # Create PDF reader
-        pdf_reader = PyPDF2.PdfReader(file.file)
 
-        # Extract text from first few pages
-        text_content = ""
-        max_pages = min(5 if use_llm else 3, len(pdf_reader.pages))
+async def extract_metadata_from_file(
+    pdf_path: Path, content_digest: bytes, filename: str, use_llm: bool = False
+) -> Dict[str, Any]:
+    """Extract metadata from a PDF on disk whose new_content_hash digest is known"""
+    return await _extract_metadata(pdf_path, content_digest, filename, use_llm=use_llm)
 
-        for page_num in range(max_pages):
-            page = pdf_reader.pages[page_num]
-            text_content += page.extract_text() + "\n"
+
+async def _extract_metadata(
+    source, content_digest: bytes, filename: str, use_llm: bool = False
+) -> Dict[str, Any]:
+    try:
+        cache_key = (content_digest, filename, use_llm)
+        cached = _metadata_cache.get(cache_key)
+        if cached is not None:
+            _metadata_cache.move_to_end(cache_key)
+            return copy.deepcopy(cached)
+
+        # Parse the PDF off the event loop; PyPDF2 and the regex heuristics are CPU-bound
+        loop = asyncio.get_running_loop()
+        max_pages = 5 if use_llm else 3
+        text_content, pdf_info = await loop.run_in_executor(
+            None, _read_pdf_head, source, max_pages
+        )
 
         if use_llm and text_content.strip():
             # Use LLM to extract metadata
             metadata = await _extract_metadata_with_llm(text_content)
+            # An empty result usually means the LLM call failed; retry next time
+            cacheable = bool(metadata)
         else:
             # Use traditional rule-based extraction
-            metadata = {}
-            if pdf_reader.metadata:
-                metadata.update(
-                    {
-                        "title": pdf_reader.metadata.get("/Title", ""),
-                        "authors": _parse_authors(
-                            pdf_reader.metadata.get("/Author", "")
-                        ),
-                        "subject": pdf_reader.metadata.get("/Subject", ""),
-                        "creator": pdf_reader.metadata.get("/Creator", ""),
-                    }
-                )
-
-            # Try to extract title and abstract from text if not in metadata
-            if not metadata.get("title"):
-                title = _extract_title_from_text(text_content)
-                if title:
-                    metadata["title"] = title
-
-            if not metadata.get("authors"):
-                # Extract authors while avoiding the title
-                extracted_title = metadata.get("title", "")
-                authors = _extract_authors_from_text(text_content, excluded_title=extracted_title)
-                if authors:
-                    metadata["authors"] = authors
-
-            # Abstract extraction disabled - will be generated on demand via LLM
-            # abstract = _extract_abstract_from_text(text_content)
-            # if abstract:
-            #     metadata['abstract'] = abstract
-
-            year = _extract_year_from_text(text_content)
-            if year:
-                metadata["year"] = year
-
-            doi = _extract_doi_from_text(text_content)
-            if doi:
-                metadata["doi"] = doi
+            cacheable = True
+            metadata = await loop.run_in_executor(
+                None, _extract_metadata_with_rules, text_content, pdf_info
+            )
 
         # Ensure we have at least a title
         if not metadata.get("title"):
-            metadata["title"] = Path(file.filename).stem
+            metadata["title"] = Path(filename).stem
 
         if not metadata.get("authors"):
             metadata["authors"] = []
 
+        if cacheable:
+            _metadata_cache[cache_key] = copy.deepcopy(metadata)
+            if len(_metadata_cache) > _METADATA_CACHE_SIZE:
+                _metadata_cache.popitem(last=False)
+
         return metadata
 
     except Exception as e:
         # Fallback to filename-based metadata
         return {
-            "title": Path(file.filename).stem,
+            "title": Path(filename).stem,
             "authors": [],
             "abstract": "",  # Keep abstract empty by default
         }
 
 
+def _read_pdf_head(source, max_pages: int) -> tuple[str, Dict[str, Any]]:
+    """Extract text from the first pages of a PDF along with its document info
+
+    source is a path or a binary file object. Paths are opened here because
+    PyPDF2 reads a path fully into memory but seeks lazily in a file object.
+    """
+    if isinstance(source, (str, Path)):
+        with open(source, "rb") as f:
+            return _read_pdf_head(f, max_pages)
+
+    pdf_reader = PyPDF2.PdfReader(source)
+
+    text_content = ""
+    for page_num in range(min(max_pages, len(pdf_reader.pages))):
+        page = pdf_reader.pages[page_num]
+        text_content += page.extract_text() + "\n"
+
+    return text_content, dict(pdf_reader.metadata or {})
+
+
+def _extract_metadata_with_rules(text_content: str, pdf_info: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract metadata using document info and text heuristics"""
+    metadata = {}
+    if pdf_info:
+        metadata.update(
+            {
+                "title": pdf_info.get("/Title", ""),
+                "authors": _parse_authors(pdf_info.get("/Author", "")),
+                "subject": pdf_info.get("/Subject", ""),
+                "creator": pdf_info.get("/Creator", ""),
+            }
+        )
+
+    # Try to extract title and abstract from text if not in metadata
+    if not metadata.get("title"):
+        title = _extract_title_from_text(text_content)
+        if title:
+            metadata["title"] = title
+
+    if not metadata.get("authors"):
+        # Extract authors while avoiding the title
+        extracted_title = metadata.get("title", "")
+        authors = _extract_authors_from_text(text_content, excluded_title=extracted_title)
+        if authors:
+            metadata["authors"] = authors
+
+    # Abstract extraction disabled - will be generated on demand via LLM
+    # abstract = _extract_abstract_from_text(text_content)
+    # if abstract:
+    #     metadata['abstract'] = abstract
+
+    year = _extract_year_from_text(text_content)
+    if year:
+        metadata["year"] = year
+
+    doi = _extract_doi_from_text(text_content)
+    if doi:
+        metadata["doi"] = doi
+
+    return metadata
+
+
 async def _extract_metadata_with_llm(text_content: str) -> Dict[str, Any]:
     """Extract metadata using LLM"""
+    if not _llm_breaker.allow():
+        return {}
+
+    provider_called = False
     try:
         provider = get_llm_provider()
 
@@ -116,37 +289,42 @@ async def _extract_metadata_with_llm(text_content: str) -> Dict[str, Any]:
         if hasattr(provider, "client"):
             # For OpenAI
             if "openai" in str(type(provider)):
-                response = await provider.client.chat.completions.create(
-                    model="gpt-4",
-                    messages=[
-                        {"role": "system", "content": prompt},
-                        {
-                            "role": "user",
-                            "content": text_content[:8000],
-                        },  # Limit text length
-                    ],
-                    max_tokens=1000,
-                    temperature=0.1,
-                )
+                # Shares the summary endpoints' rate budget; the timeout covers queueing
+                async with asyncio.timeout(_LLM_METADATA_TIMEOUT), llm_rate_limiter.slot():
+                    provider_called = True
+                    response = await provider.client.chat.completions.create(
+                        model="gpt-4",
+                        messages=[
+                            {"role": "system", "content": prompt},
+                            {
+                                "role": "user",
+                                "content": text_content[:8000],
+                            },  # Limit text length
+                        ],
+                        max_tokens=1000,
+                        temperature=0.1,
+                    )
                 result = response.choices[0].message.content.strip()
             # For Anthropic
             else:
-                message = await provider.client.messages.create(
-                    model="claude-3-5-sonnet-20241022",
-                    max_tokens=1000,
-                    temperature=0.1,
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": f"{prompt}\n\n{text_content[:100000]}",
-                        }
-                    ],
-                )
+                async with asyncio.timeout(_LLM_METADATA_TIMEOUT), llm_rate_limiter.slot():
+                    provider_called = True
+                    message = await provider.client.messages.create(
+                        model="claude-3-5-sonnet-20241022",
+                        max_tokens=1000,
+                        temperature=0.1,
+                        messages=[
+                            {
+                                "role": "user",
+                                "content": f"{prompt}\n\n{text_content[:100000]}",
+                            }
+                        ],
+                    )
                 result = message.content[0].text.strip()
 
-            # Parse JSON result
-            import json
+            _llm_breaker.record_success()
 
+            # Parse JSON result
             try:
                 # Remove any markdown code blocks
                 if result.startswith("```"):
@@ -154,7 +332,7 @@ async def _extract_metadata_with_llm(text_content: str) -> Dict[str, Any]:
                     if result.startswith("json"):
                         result = result[4:]
 
-                metadata = json.loads(result)
+                metadata = orjson.loads(result)
 
                 # Clean up the metadata
                 cleaned_metadata = {}
@@ -180,13 +358,22 @@ async def _extract_metadata_with_llm(text_content: str) -> Dict[str, Any]:
 
                 return cleaned_metadata
 
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 # Fallback to empty metadata if JSON parsing fails
                 return {}
 
         return {}
 
+    except TimeoutError:
+        # Running out of time while queued for a rate-limiter slot says nothing
+        # about the provider, so only a timed-out provider call trips the breaker
+        if provider_called:
+            _llm_breaker.record_failure()
+        print("LLM metadata extraction timed out")
+        return {}
+
     except Exception as e:
+        _llm_breaker.record_failure()
         print(f"LLM metadata extraction error: {str(e)}")
         return {}
 
@@ -216,31 +403,6 @@ def _extract_title_from_text(text: str) -> Optional[str]:
     if not lines:
         return None
     
-    # Skip common header/footer patterns
-    skip_patterns = [
-        r'^(page\s+\d+|p\.\s*\d+)$',
-        r'^\d+$',
-        r'^[ivxlc]+$',  # Roman numerals
-        r'^(arxiv|doi|issn|isbn)',
-        r'^\w+\.(com|org|edu)',
-        r'^©.*\d{4}',
-        r'^published\s+in',
-        r'^proceedings\s+of',
-    ]
-    
-    # Common exclusion patterns for titles
-    exclude_patterns = [
-        r'^(abstract|introduction|keywords|references|bibliography|contents?|acknowledgments?)',
-        r'^(table\s+of\s+contents|list\s+of)',
-        r'^(figure|table|equation)\s+\d+',
-        r'^(chapter|section)\s+\d+',
-        r'^\d+\.\s+',  # Numbered sections
-        r'@.*\.(com|org|edu)',  # Email addresses
-        r'(university|college|institute|department)',
-        r'^(received|accepted|published)',
-        r'^\*.*correspondence',
-    ]
-    
     candidates = []
     
     # Analyze first 20 lines for potential titles
@@ -248,11 +410,11 @@ def _extract_title_from_text(text: str) -> Optional[str]:
         line_lower = line.lower()
         
         # Skip lines that match skip patterns
-        if any(re.search(pattern, line_lower) for pattern in skip_patterns):
+        if _TITLE_SKIP_RE.search(line_lower):
             continue
             
         # Skip lines that match exclusion patterns
-        if any(re.search(pattern, line_lower) for pattern in exclude_patterns):
+        if _TITLE_EXCLUDE_RE.search(line_lower):
             continue
         
         # Length-based filtering
@@ -260,7 +422,7 @@ def _extract_title_from_text(text: str) -> Optional[str]:
             continue
             
         # Skip lines with too many numbers or special characters
-        if len(re.findall(r'[0-9@#$%^&*()_+={}|<>?/\\]', line)) > len(line) * 0.3:
+        if len(_SPECIAL_CHAR_RE.findall(line)) > len(line) * 0.3:
             continue
             
         # Skip lines that are mostly uppercase (likely headers)
@@ -276,9 +438,8 @@ def _extract_title_from_text(text: str) -> Optional[str]:
         candidates.append((line, score, i))
     
     if candidates:
-        # Sort by score (descending) and return the best candidate
-        candidates.sort(key=lambda x: x[1], reverse=True)
-        return candidates[0][0]
+        # Return the best-scoring candidate; max keeps the earliest on ties
+        return max(candidates, key=itemgetter(1))[0]
     
     return None
 
@@ -319,9 +480,8 @@ def _calculate_title_score(line: str, position: int, all_lines: list) -> float:
         score += 5  # Titles can end with colons
         
     # Common title words
-    title_indicators = ['analysis', 'study', 'investigation', 'review', 'survey', 'approach', 
-                       'method', 'algorithm', 'system', 'framework', 'model', 'towards', 'using']
-    if any(indicator in line.lower() for indicator in title_indicators):
+    line_lower = line.lower()
+    if any(indicator in line_lower for indicator in _TITLE_SCORE_INDICATORS):
         score += 8
         
     # Check if line stands alone (not part of a paragraph)
@@ -345,32 +505,15 @@ def _extract_authors_from_text(text: str, excluded_title: str = "") -> list[str]
     if not lines:
         return []
     
-    # Skip patterns that are unlikely to contain author names
-    skip_patterns = [
-        r'^(abstract|introduction|keywords|references|bibliography)',
-        r'^(page\s+\d+|p\.\s*\d+)$',
-        r'^\d+$',
-        r'^(arxiv|doi|issn|isbn)',
-        r'^©.*\d{4}',
-        r'^(received|accepted|published)',
-        r'^(table|figure|equation)\s+\d+',
-    ]
-    
-    # Affiliation indicators (these lines might contain authors but need special handling)
-    affiliation_indicators = [
-        'university', 'college', 'institute', 'school', 'department', 'faculty',
-        'laboratory', 'center', 'centre', 'hospital', 'company', 'corporation',
-        'foundation', 'academy', 'research', 'technology', 'science'
-    ]
-    
     candidates = []
+    title_key = _normalize_title(excluded_title or "")
     
     # Search in first 25 lines for author patterns
     for i, line in enumerate(lines[:25]):
         line_lower = line.lower()
         
         # Skip lines matching skip patterns
-        if any(re.search(pattern, line_lower) for pattern in skip_patterns):
+        if _AUTHOR_SKIP_RE.search(line_lower):
             continue
         
         # Skip very long lines (likely paragraphs)
@@ -378,11 +521,11 @@ def _extract_authors_from_text(text: str, excluded_title: str = "") -> list[str]
             continue
             
         # Skip lines with too many numbers or special characters
-        if len(re.findall(r'[0-9@#$%^&*()_+={}|<>?/\\]', line)) > len(line) * 0.4:
+        if len(_SPECIAL_CHAR_RE.findall(line)) > len(line) * 0.4:
             continue
         
         # CRITICAL: Skip if line matches the extracted title
-        if excluded_title and _is_title_match(line, excluded_title):
+        if excluded_title and _is_title_match(line, title_key):
             continue
             
         # Skip if line looks like a title rather than authors
@@ -401,9 +544,8 @@ def _extract_authors_from_text(text: str, excluded_title: str = "") -> list[str]
                     candidates.append((filtered_authors, score, i))
     
     if candidates:
-        # Sort by score and return the best candidate
-        candidates.sort(key=lambda x: x[1], reverse=True)
-        return candidates[0][0]
+        # Return the best-scoring candidate; max keeps the earliest on ties
+        return max(candidates, key=itemgetter(1))[0]
     
     return []
 
@@ -424,11 +566,11 @@ def _calculate_author_score(line: str, position: int, all_lines: list) -> float:
         
     # Check for name patterns
     # Pattern 1: "Firstname Lastname" (capitalized words)
-    name_pattern_1 = len(re.findall(r'\b[A-Z][a-z]{2,}\s+[A-Z][a-z]{2,}\b', line))
+    name_pattern_1 = len(_FULL_NAME_RE.findall(line))
     score += name_pattern_1 * 8
     
     # Pattern 2: "F. Lastname" or "Firstname M. Lastname"
-    initial_pattern = len(re.findall(r'\b[A-Z]\.\s*[A-Z][a-z]{2,}\b', line))
+    initial_pattern = len(_INITIAL_NAME_RE.findall(line))
     score += initial_pattern * 6
     
     # Pattern 3: Multiple authors separated by commas/and
@@ -443,8 +585,7 @@ def _calculate_author_score(line: str, position: int, all_lines: list) -> float:
     line_lower = line.lower()
     
     # Check for affiliation indicators
-    affiliation_count = sum(1 for indicator in ['university', 'college', 'institute', 'department'] 
-                          if indicator in line_lower)
+    affiliation_count = sum(1 for indicator in _AFFILIATION_INDICATORS if indicator in line_lower)
     if affiliation_count > 0:
         score -= affiliation_count * 15  # Heavy penalty for affiliation lines
         
@@ -453,13 +594,12 @@ def _calculate_author_score(line: str, position: int, all_lines: list) -> float:
         score -= 10
         
     # Check for numbers (addresses, phone numbers, etc.)
-    digit_count = len(re.findall(r'\d', line))
+    digit_count = len(_DIGIT_RE.findall(line))
     if digit_count > 3:
         score -= digit_count * 2
         
     # Check for common title/header words
-    header_words = ['paper', 'article', 'journal', 'conference', 'proceedings', 'volume', 'issue']
-    if any(word in line_lower for word in header_words):
+    if any(word in line_lower for word in _HEADER_WORDS):
         score -= 15
         
     # Length analysis
@@ -550,16 +690,16 @@ def _is_valid_author_name(name: str) -> bool:
         return False
         
     # Must contain at least one letter
-    if not re.search(r'[a-zA-Z]', name):
+    if not _LETTER_RE.search(name):
         return False
         
     # Check for valid name patterns
     # Pattern 1: "John Smith", "John A. Smith", "J. Smith"
-    if re.match(r'^[A-Z][a-z]*\.?\s+([A-Z]\.?\s+)*[A-Z][a-z]+$', name):
+    if _FIRST_LAST_NAME_RE.match(name):
         return True
         
     # Pattern 2: "Smith, John", "Smith, J."
-    if re.match(r'^[A-Z][a-z]+,\s+[A-Z][a-z]*\.?$', name):
+    if _LAST_FIRST_NAME_RE.match(name):
         return True
         
     # Pattern 3: Just check for reasonable capitalization
@@ -573,14 +713,20 @@ def _is_valid_author_name(name: str) -> bool:
     return False
 
 
-def _is_title_match(line: str, title: str) -> bool:
-    """Check if a line matches an extracted title"""
-    if not title or not line:
+def _normalize_title(title: str) -> tuple[str, frozenset[str]]:
+    """Normalize a title once for repeated _is_title_match calls"""
+    title_normalized = ' '.join(title.split()).lower()
+    return title_normalized, frozenset(title_normalized.split())
+
+
+def _is_title_match(line: str, title: tuple[str, frozenset[str]]) -> bool:
+    """Check if a line matches an extracted title normalized by _normalize_title"""
+    title_normalized, title_words = title
+    if not title_normalized or not line:
         return False
     
-    # Normalize both strings for comparison
-    line_normalized = ' '.join(line.strip().split()).lower()
-    title_normalized = ' '.join(title.strip().split()).lower()
+    # Normalize the line for comparison
+    line_normalized = ' '.join(line.split()).lower()
     
     # Exact match
     if line_normalized == title_normalized:
@@ -588,18 +734,17 @@ def _is_title_match(line: str, title: str) -> bool:
     
     # Check if line contains most of the title words (allowing for slight variations)
     line_words = set(line_normalized.split())
-    title_words = set(title_normalized.split())
     
     # Skip very short titles/lines for this check
     if len(title_words) < 3 or len(line_words) < 3:
         return line_normalized == title_normalized
     
-    # If 80% or more of title words are in the line, consider it a match
-    common_words = line_words.intersection(title_words)
-    if len(common_words) >= len(title_words) * 0.8:
-        return True
-    
-    return False
+    # If 80% or more of title words are in the line, consider it a match.
+    # A line with fewer distinct words than that can never reach it.
+    required = len(title_words) * 0.8
+    if len(line_words) < required:
+        return False
+    return len(line_words & title_words) >= required
 
 
 def _looks_like_title(text: str) -> bool:
@@ -615,23 +760,13 @@ def _looks_like_title(text: str) -> bool:
         return True
     
     # Check for title indicators
-    title_indicators = [
-        'analysis', 'study', 'investigation', 'review', 'survey', 'approach',
-        'method', 'algorithm', 'system', 'framework', 'model', 'towards',
-        'using', 'based', 'novel', 'improved', 'enhanced', 'automatic',
-        'efficient', 'robust', 'optimal', 'deep', 'machine', 'learning',
-        'detection', 'recognition', 'classification', 'prediction',
-        'optimization', 'evaluation', 'comparison', 'application'
-    ]
-    
     text_lower = text.lower()
-    if any(indicator in text_lower for indicator in title_indicators):
+    if any(indicator in text_lower for indicator in _TITLE_INDICATORS):
         return True
     
     # Check for title-like patterns
     # Titles often have prepositions and articles
-    title_words = ['of', 'for', 'in', 'on', 'with', 'by', 'from', 'to', 'the', 'a', 'an']
-    title_word_count = sum(1 for word in words if word.lower() in title_words)
+    title_word_count = sum(1 for word in words if word.lower() in _TITLE_FUNCTION_WORDS)
     if title_word_count >= 2:  # Multiple title words suggest it's a title
         return True
     
@@ -653,14 +788,7 @@ def _looks_like_title(text: str) -> bool:
             return True
     
     # Check for academic/technical terms that are common in titles
-    academic_terms = [
-        'research', 'experimental', 'theoretical', 'computational', 'statistical',
-        'mathematical', 'numerical', 'empirical', 'comparative', 'comprehensive',
-        'systematic', 'meta', 'multi', 'cross', 'inter', 'trans', 'bio', 'nano',
-        'micro', 'macro', 'quantum', 'neural', 'genetic', 'semantic', 'syntactic'
-    ]
-    
-    if any(term in text_lower for term in academic_terms):
+    if any(term in text_lower for term in _ACADEMIC_TERMS):
         return True
     
     # Check length and word patterns
@@ -745,8 +873,6 @@ def extract_text_from_pdf(pdf_path: str) -> str:
 
 async def extract_text_from_pdf_file(pdf_path: str) -> str:
     """Async version of extract_text_from_pdf"""
-    import asyncio
-
     return await asyncio.get_event_loop().run_in_executor(
         None, extract_text_from_pdf, pdf_path
     )
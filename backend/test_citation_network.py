@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test the citation network graph built by get_citation_network
+"""
+
+from theke.crud import citation as citation_crud, paper as paper_crud
+from theke.schemas.citation import CitationCreate
+from theke.schemas.paper import PaperCreate
+
+
+def _add_paper(db, title):
+    return paper_crud.create_paper(db, PaperCreate(title=title, authors=["A"]))
+
+
+def _cite(db, citing, **fields):
+    return citation_crud.create_citation(
+        db, CitationCreate(citing_paper_id=citing.id, **fields)
+    )
+
+
+def test_network_has_paper_nodes_and_unresolved_citation_nodes(db):
+    """Every paper is a node; only unresolved citations with a title add one"""
+    cited = _add_paper(db, "Cited")
+    citing = _add_paper(db, "Citing")
+    unresolved = _cite(db, citing, cited_title="Unresolved")
+    _cite(db, citing, cited_paper_id=cited.id, cited_title="Cited")
+    _cite(db, citing)
+
+    nodes = citation_crud.get_citation_network(db)["nodes"]
+    assert [(node["id"], node["type"], node["resolved"]) for node in nodes] == [
+        (f"paper_{cited.id}", "paper", True),
+        (f"paper_{citing.id}", "paper", True),
+        (f"citation_{unresolved.id}", "citation", False),
+    ]
+
+
+def test_edges_target_the_cited_paper_or_the_citation_node(db):
+    """Resolved edges point at the paper, unresolved ones at the citation node"""
+    cited = _add_paper(db, "Cited")
+    citing = _add_paper(db, "Citing")
+    resolved = _cite(db, citing, cited_paper_id=cited.id, cited_title="Cited")
+    unresolved = _cite(db, citing, cited_title="Unresolved")
+    _cite(db, citing)
+
+    edges = citation_crud.get_citation_network(db)["edges"]
+    assert [(edge["id"], edge["source"], edge["target"]) for edge in edges] == [
+        (f"edge_{resolved.id}", f"paper_{citing.id}", f"paper_{cited.id}"),
+        (f"edge_{unresolved.id}", f"paper_{citing.id}", f"citation_{unresolved.id}"),
+    ]
+
+
+def test_resolving_a_citation_replaces_its_node_with_an_edge_to_the_paper(db):
+    cited = _add_paper(db, "Cited")
+    citing = _add_paper(db, "Citing")
+    citation = _cite(db, citing, cited_title="Cited")
+
+    citation_crud.resolve_citation(db, citation.id, cited.id)
+
+    network = citation_crud.get_citation_network(db)
+    assert [node["id"] for node in network["nodes"]] == [f"paper_{cited.id}", f"paper_{citing.id}"]
+    assert [edge["target"] for edge in network["edges"]] == [f"paper_{cited.id}"]
+
+
+def test_long_titles_are_truncated_in_labels_only(db):
+    title = "x" * 60
+    paper = _add_paper(db, title)
+
+    node = citation_crud.get_citation_network(db)["nodes"][0]
+    assert node["label"] == "x" * 50 + "..."
+    assert node["data"]["title"] == title
+    assert node["data"]["id"] == paper.id
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Test conditional GETs on the paper list
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from theke.api import papers
+from theke.core.database import get_db
+from theke.crud import paper as paper_crud
+from theke.schemas.paper import PaperCreate
+from theke.utils.http import etag_matches
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, False),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"xyz", "abc"', True),
+    ('"xyz",W/"abc"', True),
+    ("*", True),
+    ('"xyz"', False),
+    ('"abcd"', False),
+])
+def test_etag_matches(header, expected):
+    assert etag_matches(header, '"abc"') is expected
+
+
+@pytest.fixture
+def client(db):
+    app = FastAPI()
+    app.include_router(papers.router, prefix="/api/papers")
+    app.dependency_overrides[get_db] = lambda: db
+    return TestClient(app)
+
+
+def test_paper_list_revalidation(client, db):
+    paper_crud.create_paper(db, PaperCreate(title="Paper", authors=["A"]))
+
+    response = client.get("/api/papers/", params={"include_total": False})
+    assert response.status_code == 200
+    assert "total" not in response.json()
+    etag = response.headers["etag"]
+
+    for header in (etag, f"W/{etag}", f'"stale", {etag}', "*"):
+        assert client.get(
+            "/api/papers/", params={"include_total": False}, headers={"If-None-Match": header}
+        ).status_code == 304
+    assert client.get("/api/papers/", headers={"If-None-Match": '"stale"'}).status_code == 200
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Test LLM metadata extraction against the shared rate limiter and circuit breaker
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from theke.services import pdf_processor
+from theke.services.circuit_breaker import CircuitBreaker
+from theke.services.llm_service import LLMRateLimiter
+
+
+class _Messages:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+
+    async def create(self, **kwargs):
+        await asyncio.sleep(self.delay)
+        return SimpleNamespace(content=[SimpleNamespace(text='{"title": "From LLM"}')])
+
+
+def _setup(monkeypatch, messages):
+    limiter = LLMRateLimiter(max_concurrency=1, requests_per_minute=100)
+    monkeypatch.setattr(pdf_processor, "llm_rate_limiter", limiter)
+    monkeypatch.setattr(pdf_processor, "_LLM_METADATA_TIMEOUT", 0.05)
+    monkeypatch.setattr(
+        pdf_processor, "_llm_breaker", CircuitBreaker("test", fail_threshold=3, reset_timeout=60.0)
+    )
+    monkeypatch.setattr(
+        pdf_processor, "get_llm_provider", lambda: SimpleNamespace(client=SimpleNamespace(messages=messages))
+    )
+    return limiter
+
+
+def test_waiting_for_a_busy_limiter_does_not_open_the_breaker(monkeypatch):
+    limiter = _setup(monkeypatch, _Messages())
+
+    async def scenario():
+        async with limiter.slot():
+            # Every slot is held elsewhere, e.g. by summary streams
+            for _ in range(3):
+                assert await pdf_processor._extract_metadata_with_llm("text") == {}
+        return await pdf_processor._extract_metadata_with_llm("text")
+
+    assert asyncio.run(scenario()) == {"title": "From LLM"}
+
+
+def test_provider_timeouts_open_the_breaker(monkeypatch):
+    _setup(monkeypatch, _Messages(delay=1.0))
+
+    async def scenario():
+        for _ in range(3):
+            assert await pdf_processor._extract_metadata_with_llm("text") == {}
+
+    asyncio.run(scenario())
+    assert not pdf_processor._llm_breaker.allow()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test paper search and author filtering through the full-text index
+"""
+
+from sqlalchemy import text
+
+from theke.core import database
+from theke.crud import paper as paper_crud
+from theke.schemas.paper import PaperCreate, PaperUpdate
+
+
+def _titles(db, **filters):
+    papers, total, _ = paper_crud.get_papers(db, sort_by="id", sort_order="asc", **filters)
+    assert total == len(papers)
+    return [paper.title for paper in papers]
+
+
+def _create(db, title, authors, **fields):
+    return paper_crud.create_paper(db, PaperCreate(title=title, authors=authors, **fields))
+
+
+def test_fts_index_is_enabled(db):
+    assert database.paper_fts_enabled
+
+
+def test_search_matches_substrings_case_insensitively(db):
+    _create(db, "Attention Is All You Need", ["Ashish Vaswani"])
+    _create(db, "深層学習による機械翻訳", ["山田太郎"], abstract="Transformers for translation")
+
+    assert _titles(db, search="attention") == ["Attention Is All You Need"]
+    assert _titles(db, search="TENTION IS") == ["Attention Is All You Need"]
+    assert _titles(db, search="学習に") == ["深層学習による機械翻訳"]
+    assert _titles(db, search="transformer") == ["深層学習による機械翻訳"]
+    assert _titles(db, search="vaswani") == ["Attention Is All You Need"]
+    assert _titles(db, search="nothing like this") == []
+
+
+def test_author_filter_matches_non_ascii_names_at_any_length(db):
+    _create(db, "Japanese paper", ["山田太郎", "Bob Jones"])
+    _create(db, "Other paper", ["Alice Smith"])
+
+    # Three or more characters use the index, shorter terms the LIKE fallback
+    assert _titles(db, author="山田太") == ["Japanese paper"]
+    assert _titles(db, author="山田") == ["Japanese paper"]
+    assert _titles(db, author="bob jo") == ["Japanese paper"]
+    assert _titles(db, author="al") == ["Other paper"]
+    # Author filters don't match other columns
+    assert _titles(db, author="paper") == []
+
+
+def test_short_search_terms_fall_back_to_like(db):
+    _create(db, "AI safety", ["山田太郎"])
+    _create(db, "Graphs", ["Alice"])
+
+    assert _titles(db, search="ai") == ["AI safety"]
+    assert _titles(db, search="山田") == ["AI safety"]
+
+
+def test_triggers_follow_updates_and_deletes(db):
+    paper = _create(db, "Original title", ["A"])
+    assert _titles(db, search="original") == ["Original title"]
+
+    paper_crud.update_paper(db, paper.id, PaperUpdate(title="Renamed title"))
+    assert _titles(db, search="original") == []
+    assert _titles(db, search="renamed") == ["Renamed title"]
+
+    paper_crud.delete_paper(db, paper.id)
+    assert _titles(db, search="renamed") == []
+    assert db.execute(text("SELECT count(*) FROM papers_fts")).scalar() == 0
+
+
+def test_existing_papers_are_backfilled(db):
+    with database.engine.begin() as conn:
+        for name in ("papers_fts_insert", "papers_fts_update", "papers_fts_delete"):
+            conn.execute(text(f"DROP TRIGGER {name}"))
+        conn.execute(text("DROP TABLE papers_fts"))
+    _create(db, "Created before the index", ["山田太郎"])
+
+    assert database._create_paper_fts()
+    assert _titles(db, search="before the") == ["Created before the index"]
+    assert _titles(db, author="山田太") == ["Created before the index"]
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Test linking tags to papers and reading them back in the same session
+"""
+
+from sqlalchemy import event
+
+from theke.crud import paper as paper_crud, tag as tag_crud
+from theke.schemas.paper import PaperCreate, PaperUpdate
+from theke.schemas.tag import TagCreate
+
+
+def test_tag_changes_are_visible_in_the_same_session(db):
+    paper = paper_crud.create_paper(db, PaperCreate(title="Paper", authors=["A"]))
+    tag = tag_crud.create_tag(db, TagCreate(name="ml"))
+    assert paper_crud.get_paper(db, paper.id).tags == []
+
+    assert paper_crud.add_tag_to_paper(db, paper.id, tag.id)
+    assert [t.name for t in paper_crud.get_paper(db, paper.id).tags] == ["ml"]
+
+    # Linking twice is a no-op
+    assert paper_crud.add_tag_to_paper(db, paper.id, tag.id)
+    assert len(paper_crud.get_paper(db, paper.id).tags) == 1
+
+    assert paper_crud.remove_tag_from_paper(db, paper.id, tag.id)
+    assert paper_crud.get_paper(db, paper.id).tags == []
+
+
+def test_missing_paper_or_tag_is_rejected(db):
+    paper = paper_crud.create_paper(db, PaperCreate(title="Paper", authors=["A"]))
+    tag = tag_crud.create_tag(db, TagCreate(name="ml"))
+
+    assert not paper_crud.add_tag_to_paper(db, paper.id, tag.id + 1)
+    assert not paper_crud.add_tag_to_paper(db, paper.id + 1, tag.id)
+    assert not paper_crud.remove_tag_from_paper(db, paper.id + 1, tag.id)
+    assert paper_crud.get_paper(db, paper.id).tags == []
+
+
+def test_written_paper_is_loaded_before_returning(db):
+    """Async endpoints read the result on the event loop, so it must not reload lazily"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    paper = paper_crud.create_paper(db, PaperCreate(title="Paper", authors=["A"]))
+    updated = paper_crud.update_paper(db, paper.id, PaperUpdate(pdf_path="uploads/1.pdf"))
+
+    event.listen(db.get_bind(), "before_cursor_execute", record)
+    try:
+        assert paper.id is not None
+        assert paper.created_at is not None
+        assert updated.pdf_path == "uploads/1.pdf"
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", record)
+    assert statements == []
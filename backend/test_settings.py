@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Test setting writes and the per-process setting cache
+"""
+
+from theke.crud import setting as setting_crud
+
+
+def test_upsert_returns_the_new_value(db):
+    setting_crud.clear_setting_cache()
+    # Keep loaded attributes across commits so a stale RETURNING row would show
+    db.expire_on_commit = False
+    first = setting_crud.create_or_update_setting(db, "summary_prompt", "v1")
+    assert first.value == "v1"
+
+    second = setting_crud.create_or_update_setting(db, "summary_prompt", "v2")
+    assert second.value == "v2"
+    assert second.id == first.id
+    assert setting_crud.get_setting(db, "summary_prompt").value == "v2"
+
+
+def test_cache_follows_writes(db):
+    setting_crud.clear_setting_cache()
+    assert setting_crud.get_setting_value(db, "anthropic_model", default="default") == "default"
+
+    setting_crud.create_or_update_setting(db, "anthropic_model", "model-a")
+    assert setting_crud.get_setting_value(db, "anthropic_model") == "model-a"
+
+    setting_crud.delete_setting(db, "anthropic_model")
+    assert setting_crud.get_setting_value(db, "anthropic_model", default="default") == "default"
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Test thumbnail rendering and serving
+"""
+
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from theke.api import papers
+from theke.api.papers import _render_thumbnail
+from theke.core.config import settings
+from theke.core.database import get_db
+from theke.crud import paper as paper_crud
+from theke.schemas.paper import PaperCreate, PaperUpdate
+
+TEST_PDF = Path(__file__).parent / "test.pdf"
+
+
+def test_render_writes_complete_png_atomically(tmp_path):
+    thumbnail_path = tmp_path / "paper.png"
+    _render_thumbnail(str(TEST_PDF), thumbnail_path)
+
+    assert thumbnail_path.read_bytes().startswith(b"\x89PNG\r\n\x1a\n")
+    # The temporary file was moved into place, not left behind
+    assert [path.name for path in tmp_path.iterdir()] == ["paper.png"]
+
+
+
+def test_removed_thumbnail_is_rendered_again(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    pdf_path = tmp_path / "1_thumbnail_test.pdf"
+    pdf_path.write_bytes(TEST_PDF.read_bytes())
+    paper = paper_crud.create_paper(db, PaperCreate(title="Paper", authors=["A"]))
+    paper_crud.update_paper(db, paper.id, PaperUpdate(pdf_path=str(pdf_path)))
+
+    app = FastAPI()
+    app.include_router(papers.router, prefix="/api/papers")
+    app.dependency_overrides[get_db] = lambda: db
+    client = TestClient(app)
+
+    assert client.get(f"/api/papers/{paper.id}/thumbnail").status_code == 200
+    thumbnail_path = tmp_path / "thumbnails" / "1_thumbnail_test.png"
+    thumbnail_path.unlink()
+
+    # The remembered path is stale now; the thumbnail is rendered again
+    assert client.get(f"/api/papers/{paper.id}/thumbnail").status_code == 200
+    assert thumbnail_path.exists()